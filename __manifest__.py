@@ -1,12 +1,13 @@
 {
     'name': 'Event Management System',
-    'version': '18.0.1.0',
+    'version': '18.0.1.4',
     'category': 'Services',
     'summary': 'Event booking and hall management',
     'depends': ['base', 'web'],
     'data': [
         'security/ir.model.access.csv',
         'data/sequence_data.xml',
+        'data/cron_data.xml',
         'views/event_type_views.xml',
         'views/amenity_views.xml',
         'views/hall_views.xml',
@@ -16,19 +17,31 @@
         # 'views/booking_views.xml',
         'views/booking_enhanced_views.xml',
         'views/menu_views.xml',
+        'views/hall_scheduler_views.xml',
         'reports/booking_report.xml',
+        'views/booking_report_job_views.xml',
+        'views/booking_analysis_views.xml',
+        'views/perf_stat_views.xml',
+        'views/booking_archive_views.xml',
+        'views/kitchen_plan_views.xml',
+        'views/booking_queue_views.xml',
         # 'data/menu_dishes_demo.xml',
         # 'data/menu_meal_demo.xml',
     ],
     'assets': {
         'web.assets_backend': [
+            'event_management/static/src/js/lazy_assets.js',
+        ],
+        # Loaded on demand by lazy_assets.js, not on every backend page
+        'event_management.assets_booking': [
             'event_management/static/src/css/booking_form.css',
             'event_management/static/src/css/hall.css',
             'event_management/static/src/css/menu_dishes.css',
             'event_management/static/src/css/menu_meal.css',
-            'event_management/static/src/js/booking_form.js',
             'event_management/static/src/js/meal_selection_widget.js',
+            'event_management/static/src/js/hall_timeline.js',
             'event_management/static/src/xml/meal_selection_widget.xml',
+            'event_management/static/src/xml/hall_timeline.xml',
         ],
     },
     'installable': True,
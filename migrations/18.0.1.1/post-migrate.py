@@ -0,0 +1,17 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Derive meal package prices from their dishes.
+
+    total_meal_price used to be typed in by hand; it is now computed, so
+    existing packages and the booking totals that depend on them are
+    recomputed once.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {'active_test': False})
+    meals = env['menu.meal'].search([])
+    env.add_to_compute(meals._fields['total_meal_price'], meals)
+    env.add_to_compute(meals._fields['price_breakdown'], meals)
+    meals.flush_recordset(['total_meal_price', 'price_breakdown'])
+    bookings = env['event.booking'].search([])
+    bookings._recompute_price_totals_sql()
@@ -0,0 +1,25 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Give existing bookings a reference from the sequence of their event type.
+
+    Numbers follow the booking ids, one nextval block per event type.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Booking = env['event.booking']
+    cr.execute("""
+        SELECT event_type_id, array_agg(id ORDER BY id)
+          FROM event_booking
+         WHERE reference IS NULL
+         GROUP BY event_type_id
+    """)
+    for type_id, ids in cr.fetchall():
+        sequence = Booking._get_reference_sequence(env['event.type'].browse(type_id))
+        references = Booking._allocate_references(sequence, len(ids))
+        cr.execute("""
+            UPDATE event_booking b
+               SET reference = r.reference
+              FROM unnest(%s::int[], %s::varchar[]) AS r(id, reference)
+             WHERE b.id = r.id
+        """, [ids, references])
@@ -0,0 +1,36 @@
+import logging
+
+from odoo import api, SUPERUSER_ID
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+IMAGE_MODELS = ('event.hall', 'event.amenity', 'menu.dishes')
+IMAGE_VARIANTS = ('image_512', 'image_128')
+BATCH_SIZE = 50
+
+
+def migrate(cr, version):
+    """Generate the 512 and 128 px variants of existing hall, amenity and dish images.
+
+    The images were plain binary fields and are already attachments, so
+    only the variants are new.  Records are processed BATCH_SIZE at a
+    time and the cache is dropped after each batch, so only a batch of
+    full size images is ever in memory.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {'active_test': False})
+    for model_name in IMAGE_MODELS:
+        Model = env[model_name]
+        cr.execute("""
+            SELECT res_id FROM ir_attachment
+             WHERE res_model = %s AND res_field = 'image' AND res_id IS NOT NULL
+             ORDER BY res_id
+        """, [model_name])
+        ids = [row[0] for row in cr.fetchall()]
+        for batch in split_every(BATCH_SIZE, ids, list):
+            records = Model.browse(batch)
+            for fname in IMAGE_VARIANTS:
+                env.add_to_compute(Model._fields[fname], records)
+            records.flush_recordset(list(IMAGE_VARIANTS))
+            env.invalidate_all()
+        _logger.info("Generated image variants for %s %s records", len(ids), model_name)
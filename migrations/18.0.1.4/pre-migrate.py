@@ -0,0 +1,43 @@
+import logging
+
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# Prefix of the global booking sequence, see RESERVED_CODES
+RESERVED_CODES = ('BKG',)
+
+
+def migrate(cr, version):
+    """Give every event type a code of its own before code_uniq is added.
+
+    Codes are compared without case and spaces, as the reference sequences
+    are.  The oldest type keeps its code; later duplicates and types coded
+    BKG get their id appended (WED -> WED12), and their reference sequence
+    follows so new references use the new prefix.
+    """
+    cr.execute("SELECT id, UPPER(TRIM(code)) FROM event_type WHERE code IS NOT NULL ORDER BY id")
+    rows = cr.fetchall()
+    taken = {code for _type_id, code in rows}
+    kept = set()
+    renames = []
+    for type_id, code in rows:
+        if code in kept or code in RESERVED_CODES:
+            new_code = f'{code}{type_id}'
+            while new_code in taken:
+                new_code += 'X'
+            taken.add(new_code)
+            renames.append((type_id, new_code))
+        else:
+            kept.add(code)
+    has_sequence = column_exists(cr, 'event_type', 'sequence_id')
+    for type_id, new_code in renames:
+        cr.execute("UPDATE event_type SET code = %s WHERE id = %s", [new_code, type_id])
+        if has_sequence:
+            cr.execute("""
+                UPDATE ir_sequence s
+                   SET code = %s, prefix = %s
+                  FROM event_type t
+                 WHERE t.id = %s AND s.id = t.sequence_id
+            """, [f'event.booking.{new_code}', f'{new_code}-', type_id])
+    _logger.info("Renamed %s event types with a duplicate or reserved code", len(renames))
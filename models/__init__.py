@@ -1,7 +1,22 @@
+from . import perf_stat
+from . import catalog_search
 from . import booking
 from . import amenity
 from . import hall
 from . import event_type
 from . import dish_category
 from . import menu_dishes
-from . import menu_meal
\ No newline at end of file
+from . import menu_meal
+from . import booking_import
+from . import booking_reference
+from . import booking_pricing
+from . import booking_quote
+from . import hall_availability
+from . import hall_scheduler
+from . import booking_report
+from . import booking_archive
+from . import booking_analysis
+from . import kitchen_plan
+from . import booking_queue
+from . import booking_export
+from . import data_generator
\ No newline at end of file
@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 class EventAmenity(models.Model):
     _name = 'event.amenity'
@@ -7,5 +7,14 @@ class EventAmenity(models.Model):
     name = fields.Char('Name', required=True)
     type = fields.Char('Type', required=True)
     price = fields.Float('Price')
-    image = fields.Binary('Image')
-    description = fields.Text('Description')
\ No newline at end of file
+    image = fields.Image('Image', max_width=1920, max_height=1920)
+    image_512 = fields.Image('Image 512', related='image', max_width=512, max_height=512, store=True)
+    image_128 = fields.Image('Image 128', related='image', max_width=128, max_height=128, store=True)
+    description = fields.Text('Description')
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'price' in vals:
+            # Fast path: refresh dependent booking totals in one SQL pass
+            self.env['event.booking']._recompute_pending_price_totals()
+        return res
@@ -1,6 +1,19 @@
+import logging
+import re
+
+import psycopg2
+from psycopg2.errors import ExclusionViolation
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from .perf_stat import profiled
+
+_logger = logging.getLogger(__name__)
+
+# Default lifetime of a hold, see action_hold()
+HOLD_MINUTES = 15
 
 
 class EventBooking(models.Model):
@@ -14,13 +27,16 @@ class EventBooking(models.Model):
     booking_date = fields.Date('Booking Date', required=True)
     event_type_id = fields.Many2one('event.type', string='Event Type', required=True)
     event_category_id = fields.Many2one('event.category', string='Event Category', required=True)
-    hall_id = fields.Many2one('event.hall', string='Hall', required=True)
+    hall_id = fields.Many2one('event.hall', string='Hall', required=True, index=True)
 
     status = fields.Selection([
         ('draft', 'Draft'),
+        ('hold', 'On Hold'),
         ('confirmed', 'Confirmed'),
         ('cancelled', 'Cancelled')
     ], string='Status', default='draft')
+    hold_expires_at = fields.Datetime('Hold Expires At', copy=False,
+                                      help='A held slot is released back to draft after this time')
 
     amenities = fields.Many2many('event.amenity', string='Amenities')
     amenities_total = fields.Float('Amenities Total', compute='_compute_amenities_total', store=True)
@@ -46,15 +62,56 @@ class EventBooking(models.Model):
     total_meal_price = fields.Float('Total Meal Price', compute='_compute_total_meal_price', store=True)
     grand_total = fields.Float('Grand Total', compute='_compute_grand_total', store=True)
 
+    # ==================== DATABASE SETUP ====================
+
+    def init(self):
+        """Create the hall slot index used by the availability check.
+
+        Confirmed bookings of the same hall may not overlap.  When the
+        btree_gist extension is available this is enforced by an exclusion
+        constraint on (hall_id, tsrange(start_time, end_time)); otherwise a
+        partial GiST index on the slot range keeps the batched Python check
+        below a cheap index lookup.
+        """
+        cr = self.env.cr
+        cr.execute("""
+            SELECT 1 FROM pg_constraint
+             WHERE conname = 'event_booking_hall_slot_excl'
+        """)
+        if cr.fetchone():
+            return
+        try:
+            with cr.savepoint():
+                cr.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+                cr.execute("""
+                    ALTER TABLE event_booking
+                      ADD CONSTRAINT event_booking_hall_slot_excl
+                    EXCLUDE USING gist (
+                        hall_id WITH =,
+                        tsrange(start_time, end_time) WITH &&
+                    ) WHERE (status = 'confirmed')
+                """)
+            return
+        except psycopg2.Error as e:
+            _logger.warning("Hall slot exclusion constraint not created (%s), "
+                            "falling back to a GiST range index", e)
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS event_booking_confirmed_slot_idx
+                ON event_booking USING gist (tsrange(start_time, end_time))
+             WHERE status = 'confirmed'
+        """)
+
     # ==================== COMPUTED FIELDS ====================
 
     @api.depends('amenities.price')
+    @profiled
     def _compute_amenities_total(self):
         """Calculate total cost of selected amenities for the booking"""
         for record in self:
             record.amenities_total = sum(record.amenities.mapped('price'))
 
     @api.depends('selected_dishes.price', 'selected_meal_packages.total_meal_price')
+    @profiled
     def _compute_dishes_per_person(self):
         """Calculate total cost of selected dishes and meal packages per person"""
         for record in self:
@@ -68,12 +125,14 @@ class EventBooking(models.Model):
             record.dishes_per_person = dishes_total + meal_packages_total
 
     @api.depends('dishes_per_person', 'total_person')
+    @profiled
     def _compute_total_dishes_cost(self):
         """Calculate total dishes cost for all persons"""
         for record in self:
             record.total_dishes_cost = record.dishes_per_person * record.total_person
 
     @api.depends('selected_meal_packages.total_meal_price', 'total_person')
+    @profiled
     def _compute_total_meal_price(self):
         """Calculate total meal package cost (packages * persons)"""
         for record in self:
@@ -81,21 +140,23 @@ class EventBooking(models.Model):
             record.total_meal_price = meal_packages_total * record.total_person
 
     @api.depends('total_dishes_cost', 'amenities_total')
+    @profiled
     def _compute_grand_total(self):
         """Calculate grand total (dishes + meals + amenities)"""
         for record in self:
             record.grand_total = record.total_dishes_cost + record.amenities_total
 
     @api.depends('meat_type_filter', 'excluded_meal_packages')
+    @profiled
     def _compute_available_meal_packages(self):
         """Compute available meal packages based on meat type filter and excluded packages"""
+        catalog = self.env['menu.meal']._get_catalog()
         for record in self:
-            domain = [('active', '=', True)]
-            if record.meat_type_filter:
-                domain.append(('meat_type', '=', record.meat_type_filter))
+            meal_ids = catalog.get((record.meat_type_filter or None, None), ())
             if record.excluded_meal_packages:
-                domain.append(('id', 'not in', record.excluded_meal_packages.ids))
-            record.available_meal_packages = self.env['menu.meal'].search(domain)
+                excluded = set(record.excluded_meal_packages.ids)
+                meal_ids = [meal_id for meal_id in meal_ids if meal_id not in excluded]
+            record.available_meal_packages = self.env['menu.meal'].browse(meal_ids)
 
     # ==================== ONCHANGE METHODS ====================
 
@@ -103,44 +164,142 @@ class EventBooking(models.Model):
     def _onchange_total_person(self):
         """Auto-suggest suitable hall based on person count when total_person changes"""
         if self.total_person:
-            suitable_hall = self.env['event.hall'].search([
-                ('capacity', '>=', self.total_person)
-            ], order='capacity asc', limit=1)
+            suitable_hall = self.env['event.hall'].suggest(
+                self.total_person, self.start_time, self.end_time, self._origin.id)
             if suitable_hall:
-                self.hall_id = suitable_hall.id
+                self.hall_id = suitable_hall['id']
 
     # ==================== VALIDATION METHODS ====================
 
-    @api.constrains('start_time', 'end_time', 'hall_id', 'booking_date')
+    @api.constrains('start_time', 'end_time', 'hall_id', 'booking_date', 'status')
+    @profiled
     def _check_hall_availability(self):
         """Validate hall availability - prevent double booking of same hall at same time"""
         for record in self:
             if record.start_time >= record.end_time:
                 raise ValidationError("End time must be after start time")
 
-            existing = self.search([
-                ('hall_id', '=', record.hall_id.id),
-                ('booking_date', '=', record.booking_date),
-                ('status', '=', 'confirmed'),
-                ('id', '!=', record.id),
-                '|',
-                '&', ('start_time', '<=', record.start_time), ('end_time', '>', record.start_time),
-                '&', ('start_time', '<', record.end_time), ('end_time', '>=', record.end_time)
-            ])
-            if existing:
-                raise ValidationError(f"Hall {record.hall_id.name} is already booked for this time slot")
+        # With the exclusion constraint the flush itself rejects an overlap
+        try:
+            with self.env.cr.savepoint(flush=False):
+                self.flush_model(['hall_id', 'start_time', 'end_time', 'status', 'hold_expires_at'])
+        except ExclusionViolation as e:
+            if e.diag.constraint_name != 'event_booking_hall_slot_excl':
+                raise
+            # Detail reads "Key (hall_id, tsrange(start_time, end_time))=(<hall id>, ...) conflicts ..."
+            match = re.search(r'\)=\((\d+),', e.diag.message_detail or '')
+            hall = self.env['event.hall'].browse(int(match.group(1))) if match else self[:1].hall_id
+            raise ValidationError(f"Hall {hall.name} is already booked for this time slot") from e
+
+        conflicts = self._get_hall_conflicts()
+        if conflicts:
+            record = self.browse(next(iter(conflicts)))
+            raise ValidationError(f"Hall {record.hall_id.name} is already booked for this time slot")
+
+    def _get_hall_conflicts(self):
+        """Return {booking_id: [conflicting confirmed booking ids]} for the recordset.
+
+        The whole recordset is checked with a single query.  Two slots overlap
+        when each starts before the other ends, which also covers bookings
+        that fully contain the new slot.  Confirmed bookings in the recordset
+        are checked against each other as well.
+        """
+        ids = [record_id for record_id in self.ids if record_id]
+        if not ids:
+            return {}
+        self.flush_model(['hall_id', 'start_time', 'end_time', 'status', 'hold_expires_at'])
+        # Lower bound on o.end_time, lets the planner range scan the partial
+        # (hall_id, end_time) index of confirmed bookings
+        floor = min(filter(None, self.mapped('start_time')), default=None)
+        if floor is None:
+            return {}
+        self.env.cr.execute("""
+            SELECT b.id, array_agg(o.id ORDER BY o.id)
+              FROM event_booking b
+              JOIN event_booking o
+                ON o.hall_id = b.hall_id
+               AND o.id != b.id
+               AND o.end_time > %s
+               AND (o.status = 'confirmed'
+                    OR (o.status = 'hold' AND o.hold_expires_at > (now() at time zone 'UTC')))
+               AND tsrange(o.start_time, o.end_time) && tsrange(b.start_time, b.end_time)
+             WHERE b.id IN %s
+               AND b.status != 'cancelled'
+               AND b.start_time < b.end_time
+             GROUP BY b.id
+        """, [floor, tuple(ids)])
+        return dict(self.env.cr.fetchall())
 
     # ==================== BOOKING STATUS ACTIONS ====================
 
     def action_confirm(self):
-        """Confirm the booking - changes status from draft to confirmed"""
-        for rec in self:
-            rec.status = 'confirmed'
+        """Confirm the booking - changes status from draft (or hold) to confirmed
+
+        The hall days of the whole batch are locked first, in a fixed order,
+        so concurrent confirmations of the same slot are serialized and a
+        batch can never deadlock against another one.
+        """
+        bookings = self.filtered(lambda rec: rec.status in ('draft', 'hold'))
+        bookings._lock_hall_days()
+        bookings.write({'status': 'confirmed', 'hold_expires_at': False})
 
     def action_cancel(self):
         """Cancel the booking - changes status to cancelled (preserves record)"""
+        self.write({'status': 'cancelled', 'hold_expires_at': False})
+
+    def action_hold(self, minutes=None):
+        """Reserve the slot for a short time without confirming it
+
+        The hold blocks the hall like a confirmed booking until it expires;
+        the release cron then puts the booking back to draft.
+        """
+        if minutes is None:
+            minutes = int(self.env['ir.config_parameter'].sudo().get_param(
+                'event_management.hold_minutes', HOLD_MINUTES))
+        bookings = self.filtered(lambda rec: rec.status == 'draft')
+        bookings._lock_hall_days()
+        bookings.write({
+            'status': 'hold',
+            'hold_expires_at': fields.Datetime.now() + timedelta(minutes=minutes),
+        })
+
+    def _lock_hall_days(self):
+        """Take a transaction advisory lock per (hall, day) covered by the recordset
+
+        Locks are taken in (hall, day) order.  They are held until commit,
+        so the availability check that follows sees every booking committed
+        by a competing transaction on the same hall and day.
+        """
+        keys = set()
         for rec in self:
-            rec.status = 'cancelled'
+            if not rec.hall_id:
+                continue
+            days = {rec.booking_date}
+            if rec.start_time and rec.end_time:
+                day = rec.start_time.date()
+                while day <= (rec.end_time - timedelta(microseconds=1)).date():
+                    days.add(day)
+                    day += timedelta(days=1)
+            keys.update((rec.hall_id.id, day.toordinal()) for day in days if day)
+        if not keys:
+            return
+        hall_ids, days = zip(*sorted(keys))
+        # OFFSET 0 keeps the sort below the lock calls
+        self.env.cr.execute("""
+            SELECT pg_advisory_xact_lock(k.hall_id, k.day)
+              FROM (SELECT hall_id, day
+                      FROM unnest(%s::int[], %s::int[]) WITH ORDINALITY AS u(hall_id, day, n)
+                     ORDER BY n OFFSET 0) k
+        """, [list(hall_ids), list(days)])
+
+    @api.model
+    def _cron_release_expired_holds(self):
+        """Put bookings whose hold has expired back to draft"""
+        expired = self.search([
+            ('status', '=', 'hold'),
+            ('hold_expires_at', '<=', fields.Datetime.now()),
+        ])
+        expired.write({'status': 'draft', 'hold_expires_at': False})
 
     # ==================== MEAT TYPE FILTER ACTIONS ====================
 
@@ -161,6 +320,7 @@ class EventBooking(models.Model):
 
     # ==================== MEAL PACKAGE MANAGEMENT ====================
 
+    @profiled
     def action_select_meal_from_kanban(self):
         """Select meal package from kanban view"""
         meal_id = self.env.context.get('meal_id')
@@ -188,6 +348,78 @@ class EventBooking(models.Model):
             self.selected_dishes = [(3, dish_id)]
         return False  # Changed from True to False
 
+    def apply_meal_changes(self, ops):
+        """Apply a batch of meal selection operations with a single write.
+
+        ops is a list, applied in order, of {'op': 'add' | 'remove', 'meal_id': id},
+        {'op': 'exclude' | 'include', 'meal_id': id} and
+        {'op': 'filter', 'meat_type': 'chicken' | 'mutton' | 'beef' | False}.
+        Excluding a package also removes it from the selection, and an
+        excluded package can't be added until it is included again.
+        Returns only what the meal selection widget needs to redraw.
+        """
+        self.ensure_one()
+        meat_types = dict(self._fields['meat_type_filter'].selection)
+        current = set(self.selected_meal_packages.ids)
+        current_excluded = set(self.excluded_meal_packages.ids)
+        selected, excluded = set(current), set(current_excluded)
+        vals = {}
+        for op in ops:
+            if op.get('op') == 'add':
+                if op['meal_id'] in excluded:
+                    package = self.env['menu.meal'].browse(op['meal_id'])
+                    raise ValidationError(f"Meal package {package.name} is excluded from this booking")
+                selected.add(op['meal_id'])
+            elif op.get('op') == 'remove':
+                selected.discard(op['meal_id'])
+            elif op.get('op') == 'exclude':
+                excluded.add(op['meal_id'])
+                selected.discard(op['meal_id'])
+            elif op.get('op') == 'include':
+                excluded.discard(op['meal_id'])
+            elif op.get('op') == 'filter':
+                meat_type = op.get('meat_type')
+                vals['meat_type_filter'] = meat_type if meat_type in meat_types else False
+            else:
+                raise ValidationError(f"Unknown meal operation: {op.get('op')}")
+
+        for fname, before, after in (('selected_meal_packages', current, selected),
+                                     ('excluded_meal_packages', current_excluded, excluded)):
+            commands = [(4, meal_id) for meal_id in after - before]
+            commands += [(3, meal_id) for meal_id in before - after]
+            if commands:
+                vals[fname] = commands
+        if vals:
+            self.write(vals)
+        return self._get_meal_selection_state()
+
+    def _get_meal_selection_state(self):
+        """Package ids, package prices and price totals shown by the meal selection widget"""
+        self.ensure_one()
+        packages = self.selected_meal_packages | self.available_meal_packages
+        return {
+            'selected_meal_package_ids': self.selected_meal_packages.ids,
+            'available_meal_package_ids': self.available_meal_packages.ids,
+            'excluded_meal_package_ids': self.excluded_meal_packages.ids,
+            'meat_type_filter': self.meat_type_filter or False,
+            'packages': {
+                package.id: {
+                    'name': package.name,
+                    'description': package.description or '',
+                    'total_meal_price': package.total_meal_price,
+                }
+                for package in packages
+            },
+            'dishes_total': sum(self.selected_dishes.mapped('price')),
+            'totals': {
+                'dishes_per_person': self.dishes_per_person,
+                'total_dishes_cost': self.total_dishes_cost,
+                'total_meal_price': self.total_meal_price,
+                'amenities_total': self.amenities_total,
+                'grand_total': self.grand_total,
+            },
+        }
+
     def action_open_meal_packages(self):
         """Open meal packages selection wizard"""
         domain = [('active', '=', True)]
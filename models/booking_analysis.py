@@ -0,0 +1,165 @@
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# First key of the refresh advisory lock, next to KITCHEN_LOCK_KEY (-1)
+ANALYSIS_LOCK_KEY = -2
+
+
+class EventBookingAnalysis(models.Model):
+    _name = 'event.booking.analysis'
+    _description = 'Event Booking Analysis'
+    _order = 'day desc'
+    _rec_name = 'day'
+    _log_access = False
+
+    # One row per day, hall, event type, category, meat type and status,
+    # over live and archived bookings.
+    # Rows are rebuilt only for days touched since the last refresh: a
+    # statement trigger on event_booking records those days in
+    # event_booking_analysis_dirty, and the refresh cron regroups them.
+    # That table is an insert-only log without a unique key, so writers
+    # touching the same day never wait on each other; the refresh dedupes.
+
+    day = fields.Date('Day', readonly=True, index=True)
+    hall_id = fields.Many2one('event.hall', string='Hall', readonly=True)
+    event_type_id = fields.Many2one('event.type', string='Event Type', readonly=True)
+    event_category_id = fields.Many2one('event.category', string='Event Category', readonly=True)
+    meat_type = fields.Selection([
+        ('chicken', 'Chicken'),
+        ('mutton', 'Mutton'),
+        ('beef', 'Beef')
+    ], string='Meat Type', readonly=True)
+    status = fields.Selection([
+        ('draft', 'Draft'),
+        ('hold', 'On Hold'),
+        ('confirmed', 'Confirmed'),
+        ('cancelled', 'Cancelled')
+    ], string='Status', readonly=True)
+    booking_count = fields.Integer('Bookings', readonly=True, aggregator='sum')
+    person_count = fields.Integer('Persons', readonly=True, aggregator='sum')
+    booked_hours = fields.Float('Booked Hours', readonly=True, aggregator='sum')
+    revenue = fields.Float('Revenue', readonly=True, aggregator='sum')
+    amenities_revenue = fields.Float('Amenities Revenue', readonly=True, aggregator='sum')
+    meal_revenue = fields.Float('Meal Package Revenue', readonly=True, aggregator='sum')
+    food_revenue = fields.Float('Food Revenue', readonly=True, aggregator='sum')
+
+    # ==================== DATABASE SETUP ====================
+
+    def init(self):
+        cr = self.env.cr
+        cr.execute("""
+            CREATE TABLE IF NOT EXISTS event_booking_analysis_dirty (
+                day date NOT NULL
+            )
+        """)
+        cr.execute("""
+            ALTER TABLE event_booking_analysis_dirty
+            DROP CONSTRAINT IF EXISTS event_booking_analysis_dirty_pkey
+        """)
+        cr.execute("""
+            CREATE OR REPLACE FUNCTION event_booking_analysis_mark_dirty() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO event_booking_analysis_dirty (day)
+                    SELECT DISTINCT booking_date FROM new_rows WHERE booking_date IS NOT NULL;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    INSERT INTO event_booking_analysis_dirty (day)
+                    SELECT DISTINCT booking_date FROM old_rows WHERE booking_date IS NOT NULL;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        # Transition tables allow only one event per trigger
+        for event, referencing in (
+            ('INSERT', 'NEW TABLE AS new_rows'),
+            ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+            ('DELETE', 'OLD TABLE AS old_rows'),
+        ):
+            name = f'event_booking_analysis_{event.lower()}'
+            cr.execute(f"DROP TRIGGER IF EXISTS {name} ON event_booking")
+            cr.execute(f"""
+                CREATE TRIGGER {name} AFTER {event} ON event_booking
+                REFERENCING {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION event_booking_analysis_mark_dirty()
+            """)
+        # On first install every existing booking day still has to be grouped
+        cr.execute("SELECT 1 FROM event_booking_analysis LIMIT 1")
+        if not cr.fetchone():
+            cr.execute("""
+                INSERT INTO event_booking_analysis_dirty (day)
+                SELECT DISTINCT booking_date FROM event_booking WHERE booking_date IS NOT NULL
+            """)
+
+    # ==================== REFRESH ====================
+
+    def _insert_rows_sql(self):
+        return """
+            INSERT INTO event_booking_analysis (
+                day, hall_id, event_type_id, event_category_id, meat_type, status,
+                booking_count, person_count, booked_hours,
+                revenue, amenities_revenue, meal_revenue, food_revenue)
+            SELECT b.booking_date, b.hall_id, b.event_type_id, b.event_category_id,
+                   b.meat_type_filter, b.status,
+                   COUNT(*),
+                   SUM(COALESCE(b.total_person, 0)),
+                   SUM(EXTRACT(EPOCH FROM b.end_time - b.start_time) / 3600.0),
+                   SUM(COALESCE(b.grand_total, 0)),
+                   SUM(COALESCE(b.amenities_total, 0)),
+                   SUM(COALESCE(b.total_meal_price, 0)),
+                   SUM(COALESCE(b.total_dishes_cost, 0))
+              FROM (
+                SELECT booking_date, hall_id, event_type_id, event_category_id, meat_type_filter,
+                       status, total_person, start_time, end_time, grand_total,
+                       amenities_total, total_meal_price, total_dishes_cost
+                  FROM event_booking
+                 UNION ALL
+                SELECT booking_date, hall_id, event_type_id, event_category_id, meat_type_filter,
+                       status, total_person, start_time, end_time, grand_total,
+                       amenities_total, total_meal_price, total_dishes_cost
+                  FROM event_booking_archive
+              ) b
+             WHERE b.booking_date IS NOT NULL {where}
+             GROUP BY b.booking_date, b.hall_id, b.event_type_id, b.event_category_id,
+                      b.meat_type_filter, b.status
+        """
+
+    @api.model
+    def _refresh(self, full=False):
+        """Rebuild the rows of the days touched since the last refresh, or everything if full"""
+        self.env['event.booking'].flush_model()
+        self.env['event.booking.archive'].flush_model()
+        cr = self.env.cr
+        # The cron and action_refresh may overlap: the second one waits, then
+        # regroups from a snapshot that sees the first one's rows
+        cr.execute("SELECT pg_advisory_xact_lock(%s, 0)", [ANALYSIS_LOCK_KEY])
+        if full:
+            cr.execute("DELETE FROM event_booking_analysis_dirty")
+            cr.execute("TRUNCATE event_booking_analysis")
+            cr.execute(self._insert_rows_sql().format(where=""))
+            days_count = None
+        else:
+            cr.execute("DELETE FROM event_booking_analysis_dirty RETURNING day")
+            days = list({row[0] for row in cr.fetchall()})
+            if not days:
+                return 0
+            cr.execute("DELETE FROM event_booking_analysis WHERE day = ANY(%s)", [days])
+            cr.execute(self._insert_rows_sql().format(where="AND b.booking_date = ANY(%s)"), [days])
+            days_count = len(days)
+        self.invalidate_model()
+        _logger.info("Booking analysis refreshed (%s days)", 'all' if full else days_count)
+        return days_count
+
+    @api.model
+    def _cron_refresh(self):
+        self._refresh()
+
+    @api.model
+    def action_refresh(self):
+        """Refresh the analysis now and reload the view"""
+        self.sudo()._refresh()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
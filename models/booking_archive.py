@@ -0,0 +1,175 @@
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_CHUNK_SIZE = 5000
+# Columns copied as they are from event_booking to event_booking_archive
+ARCHIVE_COLUMNS = (
+    'id', 'reference', 'name', 'phone', 'start_time', 'end_time', 'booking_date',
+    'event_type_id', 'event_category_id', 'hall_id', 'status', 'total_person', 'meat_type_filter',
+    'amenities_total', 'dishes_per_person', 'total_dishes_cost', 'total_meal_price', 'grand_total',
+    'create_uid', 'create_date', 'write_uid', 'write_date',
+)
+# Many2many relations moved along with the bookings
+ARCHIVE_RELATIONS = ('amenities', 'selected_dishes', 'selected_meal_packages')
+
+
+class EventBookingArchive(models.Model):
+    _name = 'event.booking.archive'
+    _description = 'Archived Event Booking'
+    _order = 'start_time desc, id desc'
+
+    # Cold bookings moved out of event_booking by the archive cron.  Rows
+    # keep their booking id, field names and price totals, so the booking
+    # report and the analysis read them the same way as live bookings.
+
+    reference = fields.Char('Reference', readonly=True, index=True)
+    name = fields.Char('Customer Name', readonly=True)
+    phone = fields.Char('Phone Number', readonly=True)
+    start_time = fields.Datetime('Event Start Time', readonly=True)
+    end_time = fields.Datetime('Event End Time', readonly=True)
+    booking_date = fields.Date('Booking Date', readonly=True, index=True)
+    event_type_id = fields.Many2one('event.type', string='Event Type', readonly=True)
+    event_category_id = fields.Many2one('event.category', string='Event Category', readonly=True)
+    hall_id = fields.Many2one('event.hall', string='Hall', readonly=True)
+    status = fields.Selection([
+        ('draft', 'Draft'),
+        ('hold', 'On Hold'),
+        ('confirmed', 'Confirmed'),
+        ('cancelled', 'Cancelled')
+    ], string='Status', readonly=True)
+    total_person = fields.Integer('Total Person', readonly=True)
+    meat_type_filter = fields.Selection([
+        ('chicken', 'Chicken'),
+        ('mutton', 'Mutton'),
+        ('beef', 'Beef')
+    ], string='Meat Type Preference', readonly=True)
+    amenities = fields.Many2many('event.amenity', 'booking_archive_amenity_rel',
+                                 'booking_id', 'amenity_id', string='Amenities', readonly=True)
+    selected_dishes = fields.Many2many('menu.dishes', 'booking_archive_dishes_rel',
+                                       'booking_id', 'dish_id', string='Selected Dishes', readonly=True)
+    selected_meal_packages = fields.Many2many('menu.meal', 'booking_archive_meal_rel',
+                                              'booking_id', 'meal_id', string='Selected Meal Packages',
+                                              readonly=True)
+    amenities_total = fields.Float('Amenities Total', readonly=True)
+    dishes_per_person = fields.Float('Dishes Per Person', readonly=True)
+    total_dishes_cost = fields.Float('Total Dishes Cost', readonly=True)
+    total_meal_price = fields.Float('Total Meal Price', readonly=True)
+    grand_total = fields.Float('Grand Total', readonly=True)
+    archived_at = fields.Datetime('Archived On', readonly=True)
+
+    def unlink(self):
+        # Archived rows count in the booking analysis, regroup their days
+        days = list(set(self.filtered('booking_date').mapped('booking_date')))
+        res = super().unlink()
+        if days:
+            self.env.cr.execute("""
+                INSERT INTO event_booking_analysis_dirty (day)
+                SELECT unnest(%s::date[])
+            """, [days])
+        return res
+
+    # ==================== ARCHIVING ====================
+
+    @api.model
+    def _get_archive_cutoff(self):
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'event_management.archive_after_days', ARCHIVE_AFTER_DAYS))
+        return fields.Datetime.now() - timedelta(days=days)
+
+    @api.model
+    def _cron_archive(self, chunk_size=ARCHIVE_CHUNK_SIZE, max_chunks=20, auto_commit=True):
+        """Move cold bookings to the archive, one chunk per transaction.
+
+        A booking is cold once it ended before the horizon
+        (event_management.archive_after_days, default 365), or was
+        cancelled and left untouched for that long.
+        """
+        cutoff = self._get_archive_cutoff()
+        for _chunk in range(max_chunks):
+            self.env.flush_all()
+            self.env.cr.execute("""
+                SELECT id FROM event_booking
+                 WHERE end_time < %(cutoff)s
+                    OR (status = 'cancelled' AND write_date < %(cutoff)s)
+                 ORDER BY id
+                 LIMIT %(limit)s
+                   FOR UPDATE SKIP LOCKED
+            """, {'cutoff': cutoff, 'limit': chunk_size})
+            ids = [row[0] for row in self.env.cr.fetchall()]
+            if not ids:
+                return
+            self._archive_bookings(ids)
+            if auto_commit:
+                self.env.cr.commit()
+            _logger.info("Archived %s bookings", len(ids))
+        # More cold bookings left, run again right away
+        self.env.ref('event_management.ir_cron_archive_bookings')._trigger()
+
+    @api.model
+    def _archive_bookings(self, ids):
+        """Copy the bookings and their relations to the archive, then delete them"""
+        cr = self.env.cr
+        Booking = self.env['event.booking']
+        columns = SQL(", ").join(SQL.identifier(column) for column in ARCHIVE_COLUMNS)
+        cr.execute(SQL("""
+            INSERT INTO event_booking_archive (%(columns)s, archived_at)
+            SELECT %(columns)s, now() at time zone 'UTC'
+              FROM event_booking
+             WHERE id = ANY(%(ids)s)
+            ON CONFLICT (id) DO NOTHING
+        """, columns=columns, ids=ids))
+        for fname in ARCHIVE_RELATIONS:
+            source = Booking._fields[fname]
+            target = self._fields[fname]
+            cr.execute(SQL("""
+                INSERT INTO %(target)s (%(target_booking)s, %(target_other)s)
+                SELECT %(source_booking)s, %(source_other)s
+                  FROM %(source)s
+                 WHERE %(source_booking)s = ANY(%(ids)s)
+                ON CONFLICT DO NOTHING
+            """,
+                target=SQL.identifier(target.relation),
+                target_booking=SQL.identifier(target.column1),
+                target_other=SQL.identifier(target.column2),
+                source=SQL.identifier(source.relation),
+                source_booking=SQL.identifier(source.column1),
+                source_other=SQL.identifier(source.column2),
+                ids=ids,
+            ))
+        # Attachments (confirmation PDFs) follow the booking to its archive
+        # row, which keeps the id; the raw DELETE would orphan them
+        self.env['ir.attachment'].flush_model(['res_model', 'res_id'])
+        cr.execute("""
+            UPDATE ir_attachment SET res_model = %s
+             WHERE res_model = %s AND res_id = ANY(%s)
+        """, [self._name, Booking._name, ids])
+        # Relation rows of event_booking go with it (ON DELETE CASCADE),
+        # report jobs included
+        cr.execute("DELETE FROM event_booking WHERE id = ANY(%s)", [ids])
+        self.env.invalidate_all()
+
+
+class EventBookingLiveIndex(models.Model):
+    _inherit = 'event.booking'
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS event_booking_hold_idx
+                ON event_booking (hall_id, end_time)
+             WHERE status = 'hold'
+        """)
+        # Static predicate: the index never needs a rebuild, and the archive
+        # cron keeps it small by moving past bookings out of the table
+        self.env.cr.execute("DROP INDEX IF EXISTS event_booking_upcoming_confirmed_idx")
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS event_booking_confirmed_end_idx
+                ON event_booking (hall_id, end_time, start_time)
+             WHERE status = 'confirmed'
+        """)
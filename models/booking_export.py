@@ -0,0 +1,277 @@
+import csv
+import logging
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_PAGE_SIZE = 5000
+# See _get_export_watermark()
+EXPORT_WATERMARK_LAG_WARNING = timedelta(minutes=10)
+# event_booking columns of the bookings table, with their type
+EXPORT_COLUMNS = (
+    ('id', 'int'), ('reference', 'str'), ('name', 'str'), ('phone', 'str'),
+    ('start_time', 'datetime'), ('end_time', 'datetime'), ('booking_date', 'date'),
+    ('event_type_id', 'int'), ('event_category_id', 'int'), ('hall_id', 'int'),
+    ('status', 'str'), ('total_person', 'int'), ('meat_type_filter', 'str'),
+    ('amenities_total', 'float'), ('dishes_per_person', 'float'), ('total_dishes_cost', 'float'),
+    ('total_meal_price', 'float'), ('grand_total', 'float'),
+    ('create_date', 'datetime'), ('write_date', 'datetime'),
+)
+# Line table -> (booking many2many, column of the other id)
+EXPORT_LINES = {
+    'booking_amenities': ('amenities', 'amenity_id'),
+    'booking_dishes': ('selected_dishes', 'dish_id'),
+    'booking_meal_packages': ('selected_meal_packages', 'meal_id'),
+}
+EXPORT_FORMATS = ('csv', 'parquet')
+
+
+class _CsvTableWriter:
+    """Append rows to a CSV file, header first"""
+
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _type in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetTableWriter:
+    """Append rows to a Parquet file, one row group per page"""
+
+    TYPES = {
+        'int': lambda: pyarrow.int64(),
+        'str': lambda: pyarrow.string(),
+        'float': lambda: pyarrow.float64(),
+        'date': lambda: pyarrow.date32(),
+        'datetime': lambda: pyarrow.timestamp('us'),
+    }
+
+    def __init__(self, path, columns):
+        self.schema = pyarrow.schema([(name, self.TYPES[type_]()) for name, type_ in columns])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression='snappy')
+
+    def write(self, rows):
+        if rows:
+            columns = list(zip(*rows))
+            self.writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+                schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class EventBookingExport(models.Model):
+    _inherit = 'event.booking'
+
+    def init(self):
+        super().init()
+        # Incremental pulls filter on write_date
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS event_booking_write_date_idx ON event_booking (write_date)
+        """)
+
+    # ==================== BULK EXPORT ====================
+
+    @api.model
+    def bulk_export(self, file_format='csv', updated_since=None, page_size=EXPORT_PAGE_SIZE):
+        """Export bookings and their selections to a zip attachment, page by page.
+
+        The zip holds a ``bookings`` table and one line table per
+        many2many (``booking_amenities``, ``booking_dishes``,
+        ``booking_meal_packages``) as (booking_id, other id) pairs, in CSV
+        or Parquet.  With ``updated_since`` only bookings written since
+        then are exported.  Pass the returned ``next_updated_since`` to the
+        following pull; a booking may come twice, so consumers should
+        upsert by id.
+
+        Bookings are read by keyset pages of ``page_size`` ids and each
+        page is appended to the table files right away, so building the
+        tables takes one page of memory.  Storing the finished zip reads it
+        into memory once, so peak memory grows with the compressed size of
+        the export.  Returns {'attachment_id',
+        'bookings', 'lines': {table: count}, 'next_updated_since'}.
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise UserError(f"Unsupported export format: {file_format}")
+        if file_format == 'parquet' and pyarrow is None:
+            raise UserError("Parquet export needs the pyarrow Python package")
+        self.check_access('read')
+        updated_since = fields.Datetime.to_datetime(updated_since) if updated_since else None
+        page_size = max(int(page_size or EXPORT_PAGE_SIZE), 1)
+        self.flush_model()
+        self.env.cr.execute("SELECT now() at time zone 'UTC'")
+        started_at = self.env.cr.fetchone()[0]
+        next_updated_since = self._get_export_watermark()
+
+        writer_class = _ParquetTableWriter if file_format == 'parquet' else _CsvTableWriter
+        line_columns = {table: (('booking_id', 'int'), (other, 'int'))
+                        for table, (_fname, other) in EXPORT_LINES.items()}
+        counts = dict.fromkeys(EXPORT_LINES, 0)
+        booking_count = 0
+        with tempfile.TemporaryDirectory(prefix='event_export_') as tmpdir:
+            paths = {table: os.path.join(tmpdir, f'{table}.{file_format}')
+                     for table in ('bookings', *EXPORT_LINES)}
+            writers = {'bookings': writer_class(paths['bookings'], EXPORT_COLUMNS)}
+            writers.update({table: writer_class(paths[table], columns)
+                            for table, columns in line_columns.items()})
+            try:
+                for page in self._iter_export_pages(updated_since, page_size):
+                    ids = [row[0] for row in page]
+                    writers['bookings'].write(page)
+                    booking_count += len(page)
+                    for table, rows in self._fetch_export_lines(ids).items():
+                        writers[table].write(rows)
+                        counts[table] += len(rows)
+                    _logger.info("Exported %s bookings", booking_count)
+            finally:
+                for writer in writers.values():
+                    writer.close()
+
+            zip_path = os.path.join(tmpdir, 'export.zip')
+            compression = zipfile.ZIP_DEFLATED if file_format == 'csv' else zipfile.ZIP_STORED
+            with zipfile.ZipFile(zip_path, 'w', compression) as archive:
+                for table, path in paths.items():
+                    archive.write(path, os.path.basename(path))
+            suffix = f'-since-{updated_since:%Y%m%d%H%M%S}' if updated_since else ''
+            attachment = self._store_export_file(
+                zip_path, f'bookings-{started_at:%Y%m%d%H%M%S}{suffix}-{file_format}.zip')
+        return {
+            'attachment_id': attachment.id,
+            'bookings': booking_count,
+            'lines': counts,
+            'next_updated_since': fields.Datetime.to_string(next_updated_since),
+        }
+
+    @api.model
+    def bulk_export_queued(self, file_format='csv', updated_since=None, page_size=EXPORT_PAGE_SIZE):
+        """Queue bulk_export() as a background job and return the job key.
+
+        Once the job is done its ``args`` hold the ``result`` of the export.
+        """
+        updated_since = fields.Datetime.to_string(fields.Datetime.to_datetime(updated_since)) \
+            if updated_since else False
+        key = f'export:{file_format}:{updated_since or "all"}:{page_size}'
+        self.env['event.booking.job'].sudo()._enqueue([{
+            'job_type': 'export',
+            'key': key,
+            'args': {'file_format': file_format, 'updated_since': updated_since,
+                     'page_size': page_size, 'uid': self.env.uid},
+        }])
+        return key
+
+    @api.model
+    def _get_export_watermark(self):
+        """Return where the next incremental pull has to start from.
+
+        write_date is the start time of the writing transaction, so a
+        transaction that began before this export and commits after it
+        leaves rows older than the export start that this export cannot
+        see.  The watermark is the start of the oldest transaction running
+        a statement on the database: the next pull overlaps this one on
+        purpose and exports again what was written since, which consumers
+        upsert.
+
+        Idle sessions, background workers and sessions idle in transaction
+        for longer than EXPORT_WATERMARK_LAG_WARNING are left out, so a
+        forgotten psql session does not pin the watermark.  Sessions of other database roles only show up with
+        pg_read_all_stats; their xact_start is NULL otherwise and they are
+        ignored.  A watermark lagging more than EXPORT_WATERMARK_LAG_WARNING
+        behind the export start is logged, as every later pull re-exports
+        what was written since.
+        """
+        self.env.cr.execute("""
+            SELECT now() at time zone 'UTC',
+                   LEAST(now(), MIN(xact_start)) at time zone 'UTC'
+              FROM pg_stat_activity
+             WHERE datname = current_database()
+               AND backend_type = 'client backend'
+               AND state <> 'idle'
+               -- Workers sit idle in transaction between two statements;
+               -- a session left that way for longer is stuck, not busy
+               AND (state = 'active' OR state_change > now() - %s)
+        """, [EXPORT_WATERMARK_LAG_WARNING])
+        started_at, watermark = self.env.cr.fetchone()
+        if started_at - watermark > EXPORT_WATERMARK_LAG_WARNING:
+            _logger.warning("Export watermark %s lags %s behind, a long transaction is running",
+                            watermark, started_at - watermark)
+        return watermark
+
+    @api.model
+    def _iter_export_pages(self, updated_since, page_size):
+        """Yield pages of booking rows in id order, each page found from the last id of the previous one"""
+        columns = SQL(", ").join(SQL.identifier(name) for name, _type in EXPORT_COLUMNS)
+        since = SQL("AND write_date >= %s", updated_since) if updated_since else SQL()
+        last_id = 0
+        while True:
+            self.env.cr.execute(SQL("""
+                SELECT %(columns)s FROM event_booking
+                 WHERE id > %(last_id)s %(since)s
+                 ORDER BY id
+                 LIMIT %(limit)s
+            """, columns=columns, last_id=last_id, since=since, limit=page_size))
+            page = self.env.cr.fetchall()
+            if not page:
+                return
+            yield page
+            last_id = page[-1][0]
+
+    @api.model
+    def _fetch_export_lines(self, ids):
+        """Return {line table: [(booking_id, other_id)]} for the bookings, one query per table"""
+        lines = {}
+        for table, (fname, _other) in EXPORT_LINES.items():
+            field = self._fields[fname]
+            self.env.cr.execute(SQL(
+                "SELECT %s, %s FROM %s WHERE %s = ANY(%s) ORDER BY 1, 2",
+                SQL.identifier(field.column1), SQL.identifier(field.column2),
+                SQL.identifier(field.relation), SQL.identifier(field.column1), ids,
+            ))
+            lines[table] = self.env.cr.fetchall()
+        return lines
+
+    @api.model
+    def _store_export_file(self, path, name):
+        """Create an attachment from the zip file on disk"""
+        # The zip is compressed and read once here; the tables themselves
+        # never sit in memory as a whole
+        with open(path, 'rb') as f:
+            return self.env['ir.attachment'].sudo().create({
+                'name': name,
+                'raw': f.read(),
+                'res_model': self._name,
+                'mimetype': 'application/zip',
+            })
+
+
+class EventBookingJobExport(models.Model):
+    _inherit = 'event.booking.job'
+
+    job_type = fields.Selection(selection_add=[('export', 'Export Bookings')],
+                                ondelete={'export': 'cascade'})
+
+    def _run_export(self, jobs):
+        for job in jobs:
+            args = job.args
+            Booking = self.env['event.booking'].with_user(args.get('uid') or self.env.uid)
+            result = Booking.bulk_export(args['file_format'], args.get('updated_since'), args['page_size'])
+            job.args = dict(args, result=result)
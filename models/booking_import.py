@@ -0,0 +1,207 @@
+import base64
+import csv
+import io
+import json
+import logging
+from collections import defaultdict
+from itertools import islice
+
+from odoo import models, api
+from odoo.exceptions import ValidationError
+
+_logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+# Base64 characters decoded at a time by bulk_import_file(), a multiple of 4
+IMPORT_DECODE_BLOCK = 1 << 16
+
+# Import column -> (booking field, referenced model) for fields given by name
+MANY2ONE_COLUMNS = {
+    'event_type': ('event_type_id', 'event.type'),
+    'hall': ('hall_id', 'event.hall'),
+}
+MANY2MANY_COLUMNS = {
+    'amenities': ('amenities', 'event.amenity'),
+    'dishes': ('selected_dishes', 'menu.dishes'),
+    'meal_packages': ('selected_meal_packages', 'menu.meal'),
+}
+PLAIN_COLUMNS = (
+    'name', 'phone', 'start_time', 'end_time', 'booking_date',
+    'status', 'total_person', 'meat_type_filter',
+)
+
+
+class _Base64Reader(io.RawIOBase):
+    """Binary stream over a base64 string, decoded one block at a time"""
+
+    def __init__(self, content, block_size=IMPORT_DECODE_BLOCK):
+        self.content = content
+        self.block_size = block_size
+        self.pos = 0
+        self.pending = b''  # Encoded tail that does not make a full quantum yet
+        self.buffer = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self.buffer and self.pos < len(self.content):
+            block = self.content[self.pos:self.pos + self.block_size]
+            self.pos += self.block_size
+            if isinstance(block, str):
+                block = block.encode('ascii')
+            data = self.pending + b''.join(block.split())
+            cut = len(data) - len(data) % 4
+            self.buffer, self.pending = base64.b64decode(data[:cut]), data[cut:]
+        if not self.buffer and self.pending:
+            # Unpadded tail: let b64decode report it
+            self.buffer, self.pending = base64.b64decode(self.pending), b''
+        size = min(len(target), len(self.buffer))
+        target[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+
+class EventBookingImport(models.Model):
+    _inherit = 'event.booking'
+
+    # ==================== BULK IMPORT ====================
+
+    @api.model
+    def bulk_import(self, rows, chunk_size=IMPORT_CHUNK_SIZE):
+        """Create bookings from an iterable of row dicts, chunk by chunk.
+
+        References are given by name: ``event_type``, ``event_category``,
+        ``hall``, and for the many2manys ``amenities``, ``dishes`` and
+        ``meal_packages`` (a list or a ``;`` separated string).  ``*_id``
+        columns holding database ids are accepted as well.
+
+        Each chunk resolves its references with one search per model and is
+        created with a single ``create`` call, so the stored totals and the
+        hall availability constraint run once per chunk instead of once per
+        booking.  Returns the ids of the created bookings.
+        """
+        created_ids = []
+        rows = iter(rows)
+        offset = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            vals_list = self._prepare_import_vals(chunk, offset)
+            bookings = self.create(vals_list)
+            self.env.flush_all()
+            created_ids.extend(bookings.ids)
+            # Keep memory flat over long imports
+            self.env.invalidate_all()
+            offset += len(chunk)
+            _logger.info("Imported %s bookings", offset)
+        return created_ids
+
+    @api.model
+    def bulk_import_file(self, content, file_format='csv', chunk_size=IMPORT_CHUNK_SIZE):
+        """Import bookings from a base64 encoded CSV or JSON Lines file.
+
+        The content is decoded block by block while the rows are parsed, so
+        the decoded file is never held in memory whole.
+        """
+        stream = io.BufferedReader(_Base64Reader(content))
+        return self.bulk_import(self._iter_import_rows(stream, file_format), chunk_size)
+
+    @api.model
+    def _iter_import_rows(self, stream, file_format='csv'):
+        """Yield row dicts from a binary stream without loading it whole.
+
+        ``csv`` expects a header line; ``jsonl`` expects one JSON object per
+        line.  ``json`` (a single array) is accepted for small files but has
+        to be parsed at once.
+        """
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        if file_format == 'csv':
+            for row in csv.DictReader(text):
+                yield {key: value for key, value in row.items() if value not in (None, '')}
+        elif file_format == 'jsonl':
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+        elif file_format == 'json':
+            yield from json.load(text)
+        else:
+            raise ValidationError(f"Unsupported import format: {file_format}")
+
+    # ==================== REFERENCE RESOLUTION ====================
+
+    @api.model
+    def _split_names(self, value):
+        if not value:
+            return []
+        if isinstance(value, str):
+            return [name.strip() for name in value.split(';') if name.strip()]
+        return list(value)
+
+    @api.model
+    def _name_map(self, model_name, names):
+        """Map name -> [ids] for all names with a single search; more than one id means ambiguous"""
+        names = {name for name in names if isinstance(name, str)}
+        if not names:
+            return {}
+        name_map = defaultdict(list)
+        for record in self.env[model_name].with_context(active_test=False).search_read(
+                [('name', 'in', list(names))], ['name'], order='id'):
+            name_map[record['name']].append(record['id'])
+        return name_map
+
+    @api.model
+    def _resolve_name(self, name_map, column, name, index):
+        """Return the only id of name, or raise a row error for unknown and ambiguous names"""
+        ids = name_map.get(name)
+        if not ids:
+            raise ValidationError(f"Row {index}: unknown {column} '{name}'")
+        if len(ids) > 1:
+            raise ValidationError(f"Row {index}: ambiguous {column} '{name}', {len(ids)} records have this name")
+        return ids[0]
+
+    @api.model
+    def _prepare_import_vals(self, chunk, offset=0):
+        """Turn a chunk of import rows into create values, resolving names in bulk"""
+        maps = {}
+        for column, (field_name, model_name) in MANY2ONE_COLUMNS.items():
+            maps[column] = self._name_map(model_name, (row.get(column) for row in chunk))
+        for column, (field_name, model_name) in MANY2MANY_COLUMNS.items():
+            maps[column] = self._name_map(model_name, (
+                name for row in chunk for name in self._split_names(row.get(column))))
+
+        # Categories are only unique per event type
+        category_names = {row['event_category'] for row in chunk if row.get('event_category')}
+        categories = defaultdict(list)
+        if category_names:
+            for category in self.env['event.category'].search_read(
+                    [('name', 'in', list(category_names))], ['name', 'event_type_id'], order='id'):
+                categories[(category['event_type_id'][0], category['name'])].append(category['id'])
+                categories[(False, category['name'])].append(category['id'])
+
+        vals_list = []
+        for index, row in enumerate(chunk, start=offset + 1):
+            vals = {column: row[column] for column in PLAIN_COLUMNS if column in row}
+            for column, (field_name, model_name) in MANY2ONE_COLUMNS.items():
+                if row.get(field_name):
+                    vals[field_name] = int(row[field_name])
+                elif row.get(column):
+                    vals[field_name] = self._resolve_name(maps[column], column, row[column], index)
+
+            if row.get('event_category_id'):
+                vals['event_category_id'] = int(row['event_category_id'])
+            elif row.get('event_category'):
+                # Without a match in the row's event type, any event type will do
+                name = row['event_category']
+                ids = categories.get((vals.get('event_type_id'), name)) or categories.get((False, name))
+                vals['event_category_id'] = self._resolve_name({name: ids}, 'event_category', name, index)
+
+            for column, (field_name, model_name) in MANY2MANY_COLUMNS.items():
+                names = self._split_names(row.get(column))
+                if not names:
+                    continue
+                vals[field_name] = [(6, 0, [
+                    self._resolve_name(maps[column], column, name, index) for name in names])]
+            vals_list.append(vals)
+        return vals_list
@@ -0,0 +1,387 @@
+import json
+import logging
+import traceback
+from collections import defaultdict
+from datetime import date, timedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL, split_every
+
+from .booking_report import REPORT_XMLID
+
+_logger = logging.getLogger(__name__)
+
+JOB_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+# Retry delays double from BACKOFF_BASE up to BACKOFF_MAX, in seconds
+BACKOFF_BASE = 30
+BACKOFF_MAX = 3600
+# A job claimed longer ago than this belongs to a dead worker
+RUNNING_TIMEOUT = timedelta(minutes=30)
+PARAM_TRANSPORT = 'event_management.message_transport'
+DEFAULT_TRANSPORT = 'outbox'
+# Context key that turns the cache and kitchen refreshes into jobs
+DEFER_KEY = 'event_defer_side_effects'
+
+
+class EventBookingJob(models.Model):
+    _name = 'event.booking.job'
+    _description = 'Booking Side-Effect Job'
+    _order = 'id desc'
+    _rec_name = 'key'
+
+    # Work that follows a booking confirmation or cancellation and does not
+    # have to happen inside the user's request.  Jobs are queued by
+    # _enqueue() and run by the cron, a batch per transaction.  Every
+    # handler can run twice without harm: refreshes recompute from the
+    # bookings, messages are deduplicated on their key by the transport and
+    # the confirmation PDF replaces the previous one.
+
+    job_type = fields.Selection([
+        ('availability', 'Refresh Hall Availability'),
+        ('kitchen', 'Refresh Kitchen Plan'),
+        ('notify', 'Notify Customer'),
+        ('confirmation_pdf', 'Render Confirmation'),
+    ], string='Type', required=True, readonly=True, index=True)
+    key = fields.Char('Key', required=True, readonly=True, index=True,
+                      help='Jobs with the same key do the same work; pending duplicates are not queued')
+    booking_id = fields.Many2one('event.booking', string='Booking', readonly=True, ondelete='set null')
+    args = fields.Json('Arguments', readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed')
+    ], string='Status', default='pending', required=True, readonly=True)
+    attempts = fields.Integer('Attempts', readonly=True)
+    max_attempts = fields.Integer('Max Attempts', default=MAX_ATTEMPTS)
+    next_attempt_at = fields.Datetime('Next Attempt', readonly=True, default=fields.Datetime.now)
+    started_at = fields.Datetime('Started On', readonly=True)
+    done_at = fields.Datetime('Done On', readonly=True)
+    error = fields.Text('Error', readonly=True)
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS event_booking_job_pending_idx
+                ON event_booking_job (next_attempt_at, id)
+             WHERE state = 'pending'
+        """)
+
+    # ==================== QUEUEING ====================
+
+    @api.model
+    def _enqueue(self, jobs):
+        """Queue [{'job_type', 'key', 'booking_id', 'args'}] with one INSERT.
+
+        A job whose key is already pending is skipped.  The check is not
+        locked: a duplicate slipping through only repeats idempotent work.
+        """
+        jobs = list({job['key']: job for job in jobs}.values())
+        if not jobs:
+            return
+        now = fields.Datetime.now()
+        for chunk in split_every(1000, jobs):
+            self.env.cr.execute(SQL("""
+                INSERT INTO event_booking_job (job_type, key, booking_id, args, state, attempts,
+                                               max_attempts, next_attempt_at,
+                                               create_uid, create_date, write_uid, write_date)
+                SELECT v.job_type, v.key, v.booking_id, v.args::jsonb, 'pending', 0,
+                       %(max_attempts)s, %(now)s, %(uid)s, %(now)s, %(uid)s, %(now)s
+                  FROM (VALUES %(values)s) AS v(job_type, key, booking_id, args)
+                 WHERE NOT EXISTS (SELECT 1 FROM event_booking_job j
+                                    WHERE j.key = v.key AND j.state = 'pending')
+            """,
+                values=SQL(", ").join(
+                    SQL("(%s, %s, %s::int, %s)", job['job_type'], job['key'], job.get('booking_id'),
+                        json.dumps(job.get('args') or {}))
+                    for job in chunk),
+                max_attempts=MAX_ATTEMPTS,
+                now=now,
+                uid=self.env.uid,
+            ))
+        self.env.ref('event_management.ir_cron_booking_jobs')._trigger()
+
+    # ==================== PROCESSING ====================
+
+    @api.model
+    def _cron_run_jobs(self, batch_size=JOB_BATCH_SIZE, max_batches=20, auto_commit=True):
+        """Run due jobs a batch at a time, each batch claimed and finished in its own transaction"""
+        self._reset_stale_jobs()
+        for _batch in range(max_batches):
+            jobs = self._claim_jobs(batch_size)
+            if not jobs:
+                return
+            if auto_commit:
+                # Committed claims let a booking change made meanwhile queue a fresh job
+                self.env.cr.commit()
+            jobs._run()
+            if auto_commit:
+                self.env.cr.commit()
+            _logger.info("Ran %s booking jobs", len(jobs))
+        # More jobs left, run again right away
+        self.env.ref('event_management.ir_cron_booking_jobs')._trigger()
+
+    @api.model
+    def _claim_jobs(self, batch_size):
+        """Mark the next due pending jobs running and return them; jobs locked elsewhere are skipped"""
+        self.env.cr.execute("""
+            UPDATE event_booking_job
+               SET state = 'running', attempts = attempts + 1, started_at = %(now)s
+             WHERE id IN (SELECT id FROM event_booking_job
+                           WHERE state = 'pending' AND next_attempt_at <= %(now)s
+                           ORDER BY next_attempt_at, id
+                           LIMIT %(limit)s
+                             FOR UPDATE SKIP LOCKED)
+            RETURNING id
+        """, {'now': fields.Datetime.now(), 'limit': batch_size})
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_model(['state', 'attempts', 'started_at'])
+        return self.browse(sorted(ids))
+
+    @api.model
+    def _reset_stale_jobs(self):
+        """Put jobs left running by a dead worker back in the queue"""
+        self.env.cr.execute("""
+            UPDATE event_booking_job
+               SET state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                   error = 'Worker stopped while running the job'
+             WHERE state = 'running' AND started_at < %s
+        """, [fields.Datetime.now() - RUNNING_TIMEOUT])
+        self.invalidate_model(['state', 'error'])
+
+    def _run(self):
+        """Run the jobs type by type; if a whole type fails, retry its jobs one by one"""
+        by_type = defaultdict(lambda: self.browse())
+        for job in self:
+            by_type[job.job_type] |= job
+        for job_type, jobs in by_type.items():
+            handler = getattr(self, f'_run_{job_type}')
+            try:
+                with self.env.cr.savepoint():
+                    handler(jobs)
+                    jobs._mark_done()
+                continue
+            except Exception:
+                self.env.invalidate_all()
+                if len(jobs) == 1:
+                    jobs._mark_failed()
+                    continue
+            for job in jobs:
+                try:
+                    with self.env.cr.savepoint():
+                        handler(job)
+                        job._mark_done()
+                except Exception:
+                    self.env.invalidate_all()
+                    job._mark_failed()
+
+    def _mark_done(self):
+        self.write({'state': 'done', 'done_at': fields.Datetime.now(), 'error': False})
+
+    def _mark_failed(self):
+        """Record the current exception and schedule a retry, or give up after max_attempts"""
+        _logger.warning("Booking job %s failed", self.key, exc_info=True)
+        error = traceback.format_exc(limit=5)
+        if self.attempts >= self.max_attempts:
+            self.write({'state': 'failed', 'error': error})
+            return
+        delay = min(BACKOFF_BASE * 2 ** max(self.attempts - 1, 0), BACKOFF_MAX)
+        self.write({
+            'state': 'pending',
+            'error': error,
+            'next_attempt_at': fields.Datetime.now() + timedelta(seconds=delay),
+        })
+
+    def action_retry(self):
+        """Queue failed jobs again with a fresh attempt budget"""
+        self.filtered(lambda job: job.state == 'failed').write({
+            'state': 'pending',
+            'attempts': 0,
+            'next_attempt_at': fields.Datetime.now(),
+            'error': False,
+        })
+        self.env.ref('event_management.ir_cron_booking_jobs')._trigger()
+
+    # ==================== HANDLERS ====================
+
+    def _run_availability(self, jobs):
+        hall_days = defaultdict(set)
+        for job in jobs:
+            hall_days[job.args['hall_id']].add(date.fromisoformat(job.args['day']))
+        halls = self.env['event.hall'].browse(list(hall_days)).exists()
+        self.env['event.hall'].sudo().with_context(**{DEFER_KEY: False})._refresh_availability_cache(
+            {hall_id: days for hall_id, days in hall_days.items() if hall_id in halls.ids})
+
+    def _run_kitchen(self, jobs):
+        days = {date.fromisoformat(job.args['day']) for job in jobs}
+        self.env['event.kitchen.plan'].sudo().with_context(**{DEFER_KEY: False})._refresh_days(days)
+
+    def _run_notify(self, jobs):
+        messages = []
+        for job in jobs:
+            booking = job.booking_id
+            # The booking changed again since: a later job tells the newer story
+            if not booking or booking.status != job.args['status'] or not booking.phone:
+                continue
+            messages.append({
+                'key': job.key,
+                'booking_id': booking.id,
+                'phone': booking.phone,
+                'body': self._get_notification_body(booking, job.args['status']),
+            })
+        if messages:
+            self._send_messages(messages)
+
+    def _run_confirmation_pdf(self, jobs):
+        Attachment = self.env['ir.attachment'].sudo()
+        for booking in jobs.booking_id.filtered(lambda booking: booking.status == 'confirmed'):
+            pdf, _ = self.env['ir.actions.report'].sudo()._render_qweb_pdf(REPORT_XMLID, res_ids=booking.ids)
+            name = f'{booking.reference or booking.name} Confirmation.pdf'
+            Attachment.search([
+                ('res_model', '=', 'event.booking'),
+                ('res_id', '=', booking.id),
+                ('description', '=', 'confirmation'),
+            ]).unlink()
+            Attachment.create({
+                'name': name,
+                'raw': pdf,
+                'res_model': 'event.booking',
+                'res_id': booking.id,
+                'description': 'confirmation',
+                'mimetype': 'application/pdf',
+            })
+
+    # ==================== MESSAGING ====================
+
+    @api.model
+    def _get_notification_body(self, booking, status):
+        when = booking.start_time and fields.Datetime.context_timestamp(booking, booking.start_time)
+        slot = f" at {booking.hall_id.name}" if booking.hall_id else ""
+        slot += f" on {when:%Y-%m-%d %H:%M}" if when else ""
+        verb = 'is confirmed' if status == 'confirmed' else 'has been cancelled'
+        return f"Dear {booking.name}, your booking {booking.reference or ''}{slot} {verb}."
+
+    @api.model
+    def _send_messages(self, messages):
+        """Hand messages to the configured transport.
+
+        event_management.message_transport names a _transport_<name>
+        method; 'outbox' (default) stores the messages in
+        event.booking.message and 'log' only logs them.  A real SMS or
+        email gateway is added by defining another _transport_<name>.
+        """
+        name = self.env['ir.config_parameter'].sudo().get_param(PARAM_TRANSPORT, DEFAULT_TRANSPORT)
+        transport = getattr(self, f'_transport_{name}', None)
+        if transport is None:
+            raise UserError(f"Unknown message transport: {name}")
+        transport(messages)
+
+    @api.model
+    def _transport_outbox(self, messages):
+        self.env['event.booking.message']._store(messages, 'outbox')
+
+    @api.model
+    def _transport_log(self, messages):
+        for message in messages:
+            _logger.info("Message to %s: %s", message['phone'], message['body'])
+
+
+class EventBookingMessage(models.Model):
+    _name = 'event.booking.message'
+    _description = 'Booking Customer Message'
+    _order = 'id desc'
+    _rec_name = 'phone'
+
+    # Local stand-in for an SMS or email gateway: what would have been
+    # sent, once per job key.
+
+    key = fields.Char('Key', required=True, readonly=True)
+    booking_id = fields.Many2one('event.booking', string='Booking', readonly=True, ondelete='set null')
+    phone = fields.Char('Phone Number', readonly=True)
+    body = fields.Text('Message', readonly=True)
+    transport = fields.Char('Transport', readonly=True)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'A message is sent only once per key.'),
+    ]
+
+    @api.model
+    def _store(self, messages, transport):
+        """Insert the messages, skipping keys already sent"""
+        now = fields.Datetime.now()
+        self.env.cr.execute(SQL("""
+            INSERT INTO event_booking_message (key, booking_id, phone, body, transport,
+                                               create_uid, create_date, write_uid, write_date)
+            VALUES %s
+            ON CONFLICT (key) DO NOTHING
+        """, SQL(", ").join(
+            SQL("(%s, %s, %s, %s, %s, %s, %s, %s, %s)", message['key'], message['booking_id'],
+                message['phone'], message['body'], transport, self.env.uid, now, self.env.uid, now)
+            for message in messages)))
+
+
+class EventHallDeferredCache(models.Model):
+    _inherit = 'event.hall'
+
+    @api.model
+    def _refresh_availability_cache(self, hall_days):
+        if not self.env.context.get(DEFER_KEY):
+            return super()._refresh_availability_cache(hall_days)
+        self.env['event.booking.job'].sudo()._enqueue([{
+            'job_type': 'availability',
+            'key': f'availability:{hall_id}:{day}',
+            'args': {'hall_id': hall_id, 'day': day.isoformat()},
+        } for hall_id, days in hall_days.items() for day in sorted(days)])
+
+
+class EventKitchenPlanDeferred(models.Model):
+    _inherit = 'event.kitchen.plan'
+
+    @api.model
+    def _refresh_days(self, days):
+        if not self.env.context.get(DEFER_KEY):
+            return super()._refresh_days(days)
+        self.env['event.booking.job'].sudo()._enqueue([{
+            'job_type': 'kitchen',
+            'key': f'kitchen:{day}',
+            'args': {'day': day.isoformat()},
+        } for day in sorted(set(days)) if day])
+
+
+class EventBookingSideEffects(models.Model):
+    _inherit = 'event.booking'
+
+    def action_confirm(self):
+        """Confirm, and queue the customer notification, caches, kitchen plan and confirmation PDF"""
+        bookings = self.filtered(lambda rec: rec.status in ('draft', 'hold'))
+        res = super(EventBookingSideEffects, self.with_context(**{DEFER_KEY: True})).action_confirm()
+        bookings._enqueue_status_jobs('confirmed')
+        return res
+
+    def action_cancel(self):
+        """Cancel, and queue the customer notification, caches and kitchen plan"""
+        bookings = self.filtered(lambda rec: rec.status != 'cancelled')
+        res = super(EventBookingSideEffects, self.with_context(**{DEFER_KEY: True})).action_cancel()
+        bookings._enqueue_status_jobs('cancelled')
+        return res
+
+    def _enqueue_status_jobs(self, status):
+        """Queue the per-booking jobs of a status change"""
+        # write_date tells apart a second confirmation of the same booking
+        jobs = []
+        for booking in self:
+            stamp = f'{booking.write_date:%Y%m%d%H%M%S%f}' if booking.write_date else ''
+            jobs.append({
+                'job_type': 'notify',
+                'key': f'notify:{booking.id}:{status}:{stamp}',
+                'booking_id': booking.id,
+                'args': {'status': status},
+            })
+            if status == 'confirmed':
+                jobs.append({
+                    'job_type': 'confirmation_pdf',
+                    'key': f'confirmation_pdf:{booking.id}',
+                    'booking_id': booking.id,
+                })
+        self.env['event.booking.job'].sudo()._enqueue(jobs)
@@ -0,0 +1,89 @@
+from odoo import models, api, tools
+from odoo.exceptions import ValidationError
+
+from .table_version import table_version
+
+# Keys a quote scenario may carry, see quote()
+QUOTE_KEYS = ('booking_id', 'total_person', 'amenities', 'selected_dishes', 'selected_meal_packages')
+QUOTE_MAX_SCENARIOS = 100
+
+
+class EventBookingQuote(models.Model):
+    _inherit = 'event.booking'
+
+    # ==================== WHAT-IF PRICING ====================
+
+    @api.model
+    def quote(self, payload):
+        """Price one scenario or a list of scenarios without writing anything.
+
+        A scenario is a dict with ``total_person`` and the ids of its
+        ``amenities``, ``selected_dishes`` and ``selected_meal_packages``.
+        With ``booking_id`` the booking's current values fill in what the
+        scenario leaves out.  Each result holds the same totals as the
+        stored computes: amenities_total, dishes_per_person,
+        total_dishes_cost, total_meal_price and grand_total.  Inactive or
+        unknown dishes and packages count for nothing, as on a booking.
+        """
+        single = isinstance(payload, dict)
+        scenarios = [payload] if single else list(payload or ())
+        if len(scenarios) > QUOTE_MAX_SCENARIOS:
+            raise ValidationError(f"At most {QUOTE_MAX_SCENARIOS} scenarios can be quoted at once")
+        for scenario in scenarios:
+            unknown = set(scenario) - set(QUOTE_KEYS)
+            if unknown:
+                raise ValidationError(f"Unsupported quote keys: {', '.join(sorted(unknown))}")
+        self.check_access('read')
+
+        base_ids = {scenario['booking_id'] for scenario in scenarios if scenario.get('booking_id')}
+        bases = {booking.id: booking for booking in self.browse(base_ids).exists()}
+        if len(bases) != len(base_ids):
+            raise ValidationError("Some quoted bookings do not exist")
+
+        dish_prices, meal_prices, amenity_prices = self._get_price_table()
+        results = []
+        for scenario in scenarios:
+            base = bases.get(scenario.get('booking_id'))
+            persons = scenario.get('total_person', base.total_person if base else 1) or 0
+            amenity_ids = scenario.get('amenities', base.amenities.ids if base else ())
+            dish_ids = scenario.get('selected_dishes', base.selected_dishes.ids if base else ())
+            meal_ids = scenario.get('selected_meal_packages',
+                                    base.selected_meal_packages.ids if base else ())
+
+            amenities_total = sum(amenity_prices.get(amenity_id, 0.0) for amenity_id in amenity_ids)
+            meals = sum(meal_prices.get(meal_id, 0.0) for meal_id in meal_ids)
+            dishes_per_person = sum(dish_prices.get(dish_id, 0.0) for dish_id in dish_ids) + meals
+            total_dishes_cost = dishes_per_person * persons
+            results.append({
+                'booking_id': base.id if base else False,
+                'amenities_total': amenities_total,
+                'dishes_per_person': dishes_per_person,
+                'total_dishes_cost': total_dishes_cost,
+                'total_meal_price': meals * persons,
+                'grand_total': total_dishes_cost + amenities_total,
+            })
+        return results[0] if single else results
+
+    @api.model
+    def _get_price_table(self):
+        """Return ({dish_id: price}, {meal_id: total_meal_price}, {amenity_id: price}).
+
+        The tables live in the registry cache, keyed on the version of the
+        three source tables: dish and package prices are recomputed without
+        touching write_date, but every recompute writes a new row version,
+        so any price change, new or removed record yields a new key.
+        """
+        return self._build_price_table(
+            table_version(self.env, 'menu.dishes', 'menu.meal', 'event.amenity'))
+
+    @api.model
+    @tools.ormcache('version')
+    def _build_price_table(self, version):
+        cr = self.env.cr
+        cr.execute("SELECT id, COALESCE(price, 0) FROM menu_dishes WHERE active")
+        dish_prices = tools.frozendict(cr.fetchall())
+        cr.execute("SELECT id, COALESCE(total_meal_price, 0) FROM menu_meal WHERE active")
+        meal_prices = tools.frozendict(cr.fetchall())
+        cr.execute("SELECT id, COALESCE(price, 0) FROM event_amenity")
+        amenity_prices = tools.frozendict(cr.fetchall())
+        return dish_prices, meal_prices, amenity_prices
@@ -0,0 +1,117 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+REFERENCE_PADDING = 4
+GLOBAL_SEQUENCE_XMLID = 'event_management.seq_event_booking_global'
+# Prefix of the global sequence, which numbers bookings of types without a code
+RESERVED_CODES = ('BKG',)
+
+
+class EventTypeSequence(models.Model):
+    _inherit = 'event.type'
+
+    sequence_id = fields.Many2one('ir.sequence', string='Reference Sequence', copy=False, readonly=True,
+                                  help='Numbers the bookings of this event type, created on first use')
+
+    @api.constrains('code')
+    def _check_code_reserved(self):
+        for event_type in self:
+            code = (event_type.code or '').strip().upper()
+            if code in RESERVED_CODES:
+                raise ValidationError(f"The code {code} is reserved for the global booking sequence")
+
+    def _get_booking_sequence(self):
+        """Return the reference sequence of the event type, creating it on first use.
+
+        Types whose codes only differ in case or spaces number their
+        bookings from the same sequence, as does a type that takes the code
+        of a deleted one, so a prefix never restarts from 1.
+        """
+        self.ensure_one()
+        if self.sequence_id:
+            return self.sequence_id
+        code = self.code.strip().upper()
+        sequence_code = f'event.booking.{code}'
+        # Two first bookings of a code must not create two sequences
+        self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [sequence_code])
+        self.invalidate_recordset(['sequence_id'])
+        if not self.sequence_id:
+            Sequence = self.env['ir.sequence'].sudo()
+            sequence = Sequence.search([('code', '=', sequence_code)], limit=1)
+            if not sequence:
+                sequence = Sequence.create({
+                    'name': f'Event Booking {self.name}',
+                    'code': sequence_code,
+                    'prefix': f'{code}-',
+                    'padding': REFERENCE_PADDING,
+                    # PostgreSQL sequence: gaps allowed, no row lock on ir_sequence
+                    'implementation': 'standard',
+                })
+            self.sudo().sequence_id = sequence
+        return self.sequence_id
+
+    def write(self, vals):
+        res = super().write(vals)
+        if vals.get('code'):
+            # A sequence stays with its code: bookings of the new code number
+            # from its own sequence, and a later type of the old code resumes
+            # the old one instead of handing out its numbers again
+            for event_type in self.filtered('sequence_id'):
+                if event_type.sequence_id.code != f'event.booking.{event_type.code.strip().upper()}':
+                    event_type.sudo().sequence_id = False
+        return res
+
+
+class EventBookingReference(models.Model):
+    _inherit = 'event.booking'
+    _rec_names_search = ['name', 'reference']
+
+    reference = fields.Char('Reference', readonly=True, copy=False,
+                            help='Booking number, taken from the sequence of the event type')
+
+    _sql_constraints = [
+        ('reference_uniq', 'unique(reference)', 'The booking reference must be unique.'),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self._assign_references(vals_list)
+        return super().create(vals_list)
+
+    @api.model
+    def _assign_references(self, vals_list):
+        """Fill in the reference of every vals dict that has none, one number block per event type"""
+        pending = defaultdict(list)
+        for vals in vals_list:
+            if not vals.get('reference'):
+                pending[vals.get('event_type_id') or False].append(vals)
+        for type_id, type_vals_list in pending.items():
+            sequence = self._get_reference_sequence(self.env['event.type'].browse(type_id))
+            for vals, reference in zip(type_vals_list, self._allocate_references(sequence, len(type_vals_list))):
+                vals['reference'] = reference
+
+    @api.model
+    def _get_reference_sequence(self, event_type):
+        if event_type and event_type.code and event_type.code.strip():
+            return event_type._get_booking_sequence()
+        return self.env.ref(GLOBAL_SEQUENCE_XMLID).sudo()
+
+    @api.model
+    def _allocate_references(self, sequence, count):
+        """Return count formatted references drawn from sequence.
+
+        Standard sequences hand out the whole block with a single nextval
+        query, which never waits on concurrent imports or web bookings.
+        No-gap and date range sequences fall back to one number at a time.
+        """
+        sequence = sequence.sudo()
+        if sequence.implementation != 'standard' or sequence.use_date_range:
+            return [sequence.next_by_id() for _ in range(count)]
+        self.env.cr.execute(SQL(
+            "SELECT nextval(%s::regclass) FROM generate_series(1, %s)",
+            f'ir_sequence_{sequence.id:03d}', count,
+        ))
+        return [sequence.get_next_char(number) for number, in self.env.cr.fetchall()]
@@ -0,0 +1,202 @@
+import base64
+import logging
+
+from odoo import models, fields, api
+from odoo.tools.pdf import merge_pdf
+
+from .menu_meal import DISH_RELATIONS
+from .perf_stat import perf_section
+
+_logger = logging.getLogger(__name__)
+
+REPORT_XMLID = 'event_management.action_report_booking_full'
+
+
+class BookingFullReport(models.AbstractModel):
+    _name = 'report.event_management.report_booking_full_document'
+    _description = 'Event Booking Full Report'
+    _booking_model = 'event.booking'
+
+    @api.model
+    def _prefetch_report_data(self, bookings):
+        """Load everything the report template reads with one query per model and relation"""
+        bookings.fetch([
+            'name', 'reference', 'phone', 'total_person', 'status', 'booking_date', 'start_time', 'end_time',
+            'event_type_id', 'event_category_id', 'hall_id', 'selected_meal_packages',
+            'selected_dishes', 'amenities', 'dishes_per_person', 'total_dishes_cost',
+            'amenities_total', 'grand_total',
+        ])
+        bookings.event_type_id.fetch(['name'])
+        bookings.event_category_id.fetch(['name'])
+        bookings.hall_id.fetch(['name'])
+        packages = bookings.selected_meal_packages
+        packages.fetch(['name', 'meat_type', 'total_meal_price', 'price_breakdown'] + list(DISH_RELATIONS))
+        dishes = bookings.selected_dishes
+        for relation in DISH_RELATIONS:
+            dishes |= packages[relation]
+        dishes.fetch(['name', 'meal_type'])
+        bookings.amenities.fetch(['name', 'price'])
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self.env[self._booking_model].browse(docids)
+        with perf_section(self.env, f'{self._name}._prefetch_report_data', len(docs)):
+            self._prefetch_report_data(docs)
+        return {
+            'doc_ids': docids,
+            'doc_model': self._booking_model,
+            'docs': docs,
+            'data': data,
+        }
+
+
+class BookingArchiveReport(models.AbstractModel):
+    _name = 'report.event_management.report_booking_archive_document'
+    _inherit = 'report.event_management.report_booking_full_document'
+    _description = 'Archived Event Booking Report'
+    _booking_model = 'event.booking.archive'
+
+
+class IrActionsReport(models.Model):
+    _inherit = 'ir.actions.report'
+
+    def _render_qweb_pdf(self, report_ref, res_ids=None, data=None):
+        report = self._get_report(report_ref)
+        if not report.report_name.startswith('event_management.'):
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+        with perf_section(self.env, f'{report.report_name}._render_qweb_pdf', len(res_ids or ())):
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+
+
+class EventBookingReportJob(models.Model):
+    _name = 'event.booking.report.job'
+    _description = 'Booking Report Rendering Job'
+    _order = 'id desc'
+
+    name = fields.Char('Name', required=True)
+    booking_ids = fields.Many2many('event.booking', 'event_booking_report_job_rel',
+                                   'job_id', 'booking_id', string='Bookings')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed')
+    ], string='Status', default='pending', required=True)
+    chunk_size = fields.Integer('Bookings per Chunk', default=50)
+    total_count = fields.Integer('Total Bookings', readonly=True)
+    done_count = fields.Integer('Rendered Bookings', readonly=True)
+    # Progress is kept by id: bookings archived meanwhile leave booking_ids
+    rendered_booking_ids = fields.Many2many('event.booking', 'event_booking_report_job_done_rel',
+                                            'job_id', 'booking_id', string='Rendered', readonly=True)
+    progress = fields.Float('Progress', compute='_compute_progress')
+    attachment_id = fields.Many2one('ir.attachment', string='Report', readonly=True)
+    report_file = fields.Binary(related='attachment_id.datas', string='Report File')
+    report_filename = fields.Char(related='attachment_id.name', string='Report Filename')
+    error = fields.Text('Error', readonly=True)
+
+    @api.depends('done_count', 'total_count')
+    def _compute_progress(self):
+        for record in self:
+            record.progress = 100.0 * record.done_count / record.total_count if record.total_count else 0.0
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        jobs = super().create(vals_list)
+        for job in jobs:
+            job.total_count = len(job.booking_ids)
+        self.env.ref('event_management.ir_cron_booking_report_jobs')._trigger()
+        return jobs
+
+    # ==================== PROCESSING ====================
+
+    @api.model
+    def _cron_process_jobs(self, max_chunks=20, auto_commit=True):
+        """Render pending jobs chunk by chunk, committing the progress after each chunk"""
+        budget = max_chunks
+        for job in self.search([('state', 'in', ('pending', 'running'))], order='id'):
+            while budget > 0 and job.state in ('pending', 'running'):
+                budget -= 1
+                try:
+                    job._process_next_chunk()
+                except Exception as e:
+                    _logger.exception("Booking report job %s failed", job.id)
+                    if auto_commit:
+                        self.env.cr.rollback()
+                    job.write({'state': 'failed', 'error': str(e)})
+                if auto_commit:
+                    self.env.cr.commit()
+            if budget <= 0:
+                # More work left, run again right away
+                self.env.ref('event_management.ir_cron_booking_report_jobs')._trigger()
+                break
+
+    def _process_next_chunk(self):
+        """Render the next chunk of bookings to a part attachment, or merge the parts when done"""
+        self.ensure_one()
+        rendered = set(self.rendered_booking_ids.ids)
+        chunk = [booking_id for booking_id in self.booking_ids.ids
+                 if booking_id not in rendered][:max(self.chunk_size, 1)]
+        if not chunk:
+            self._merge_parts()
+            return
+        self.state = 'running'
+        pdf, _ = self.env['ir.actions.report']._render_qweb_pdf(REPORT_XMLID, res_ids=chunk)
+        self.env['ir.attachment'].create({
+            'name': f'{self.name}-part-{self.done_count:07d}.pdf',
+            'raw': pdf,
+            'res_model': self._name,
+            'res_id': self.id,
+            'description': 'part',
+            'mimetype': 'application/pdf',
+        })
+        self.write({
+            'rendered_booking_ids': [(4, booking_id) for booking_id in chunk],
+            'done_count': self.done_count + len(chunk),
+        })
+        # Drop the rendered records from the cache, keep memory flat on big jobs
+        self.env.invalidate_all()
+
+    def _merge_parts(self):
+        parts = self.env['ir.attachment'].search([
+            ('res_model', '=', self._name),
+            ('res_id', '=', self.id),
+            ('description', '=', 'part'),
+        ], order='name')
+        merged = merge_pdf([part.raw for part in parts]) if len(parts) > 1 else parts.raw
+        attachment = self.env['ir.attachment'].create({
+            'name': f'{self.name}.pdf',
+            'datas': base64.b64encode(merged or b''),
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'application/pdf',
+        })
+        parts.unlink()
+        self.write({'state': 'done', 'attachment_id': attachment.id})
+
+    def action_retry(self):
+        """Restart failed jobs from the first chunk"""
+        self.env['ir.attachment'].search([
+            ('res_model', '=', self._name),
+            ('res_id', 'in', self.ids),
+            ('description', '=', 'part'),
+        ]).unlink()
+        self.write({'state': 'pending', 'done_count': 0, 'rendered_booking_ids': [(5,)], 'error': False})
+        self.env.ref('event_management.ir_cron_booking_report_jobs')._trigger()
+
+
+class EventBookingReport(models.Model):
+    _inherit = 'event.booking'
+
+    def action_print_report_background(self):
+        """Queue the full report of the selected bookings as a background job"""
+        job = self.env['event.booking.report.job'].create({
+            'name': f'Booking Reports {fields.Datetime.now():%Y-%m-%d %H-%M-%S}',
+            'booking_ids': [(6, 0, self.ids)],
+        })
+        return {
+            'name': 'Report Job',
+            'type': 'ir.actions.act_window',
+            'res_model': 'event.booking.report.job',
+            'view_mode': 'form',
+            'res_id': job.id,
+        }
@@ -0,0 +1,71 @@
+from odoo import models, api
+from odoo.exceptions import ValidationError
+
+CATALOG_PAGE_SIZE = 40
+CATALOG_MAX_PAGE_SIZE = 200
+
+
+class CatalogSearchMixin(models.AbstractModel):
+    _name = 'event.catalog.search.mixin'
+    _description = 'Catalog Search Mixin'
+
+    # Fields returned by search_catalog, and filters it accepts as {field: value}
+    _catalog_fields = ('name',)
+    _catalog_filters = ()
+    _catalog_image_field = None
+
+    @api.model
+    def search_catalog(self, filters=None, limit=CATALOG_PAGE_SIZE, after=None):
+        """Return one page of active catalog records as lean dicts.
+
+        filters maps the fields in _catalog_filters to a value to match;
+        ``name`` matches a substring (served by the trigram index).  Pages
+        are ordered by (name, id) and chained with keyset pagination: pass
+        the ``next`` cursor of a page as ``after`` to get the following one.
+        Images are never inlined; each record carries a resized, cacheable
+        ``image_url`` instead.
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(self._catalog_filters) - {'name'}
+        if unknown:
+            raise ValidationError(f"Unsupported catalog filters: {', '.join(sorted(unknown))}")
+        limit = max(1, min(int(limit or CATALOG_PAGE_SIZE), CATALOG_MAX_PAGE_SIZE))
+
+        domain = [('active', '=', True)]
+        for field_name, value in filters.items():
+            if field_name == 'name':
+                if value:
+                    domain.append(('name', 'ilike', value))
+            elif value is not None:
+                domain.append((field_name, '=', value))
+        if after:
+            after_name, after_id = after
+            domain += ['|', ('name', '>', after_name),
+                       '&', ('name', '=', after_name), ('id', '>', after_id)]
+
+        read_fields = list(self._catalog_fields)
+        if self._catalog_image_field:
+            read_fields.append('write_date')
+        records = self.search_read(domain, read_fields, order='name, id', limit=limit + 1)
+        has_more = len(records) > limit
+        records = records[:limit]
+        if self._catalog_image_field:
+            for record in records:
+                record['image_url'] = self._catalog_image_url(record['id'], record.pop('write_date'))
+        return {
+            'records': records,
+            'next': [records[-1]['name'], records[-1]['id']] if has_more else False,
+        }
+
+    @api.model
+    def _catalog_image_url(self, record_id, write_date, size=128):
+        """URL of the resized image; the unique token lets browsers cache it for good.
+
+        A stored variant such as image_128 is served as is, other sizes are
+        resized on every request.
+        """
+        unique = int(write_date.timestamp()) if write_date else 0
+        variant = f'{self._catalog_image_field}_{size}'
+        if variant in self._fields:
+            return f'/web/image/{self._name}/{record_id}/{variant}?unique={unique}'
+        return f'/web/image/{self._name}/{record_id}/{self._catalog_image_field}/{size}x{size}?unique={unique}'
@@ -0,0 +1,232 @@
+import logging
+import random
+from datetime import datetime, timedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import AccessError
+from odoo.tools import SQL, split_every
+
+_logger = logging.getLogger(__name__)
+
+GENERATOR_CHUNK_SIZE = 10000
+MEAT_TYPES = ('chicken', 'mutton', 'beef')
+MEAL_TYPES = ('breakfast', 'lunch', 'dinner', 'snacks', 'beverages')
+DISH_MEAT_TYPES = ('chicken', 'mutton', 'beef', 'fish', 'vegetarian')
+DISH_CATEGORIES = ('starter', 'main_course', 'dessert', 'soup', 'salad', 'rice', 'bread')
+AMENITY_TYPES = ('decor', 'lighting', 'sound', 'stage', 'photography')
+EVENT_TYPES = (
+    ('Wedding', 'WED'), ('Conference', 'CONF'), ('Birthday', 'BDAY'),
+    ('Corporate', 'CORP'), ('Reception', 'RECP'),
+)
+# Share of generated bookings per status
+STATUS_WEIGHTS = {'confirmed': 70, 'draft': 15, 'cancelled': 15}
+
+
+class EventDataGenerator(models.AbstractModel):
+    _name = 'event.data.generator'
+    _description = 'Event Management Synthetic Data Generator'
+
+    # Run from an Odoo shell on a throwaway database, e.g.:
+    #   env['event.data.generator'].generate(seed=42, bookings=1000000)
+    #   env.cr.commit()
+    # The same seed and sizes always produce the same data.  Catalog
+    # records go through the ORM; bookings and their relations are inserted
+    # with SQL in chunks, then priced with the set-based recompute.
+
+    @api.model
+    def generate(self, seed=42, halls=50, dish_count=2000, package_count=500, amenity_count=30,
+                 bookings=100000, days=5 * 365, start=None):
+        """Create a full synthetic data set and return the ids of what was created.
+
+        Bookings are spread over `days` days from `start` (default: three
+        years ago, so there are past and future bookings).  Bookings of a
+        hall never overlap, so every status is consistent with the hall
+        availability rules.
+        """
+        if not self.env.is_superuser() and not self.env.user.has_group('base.group_system'):
+            raise AccessError("Synthetic data can only be generated by administrators")
+        rng = random.Random(seed)
+        start = fields.Datetime.to_datetime(start) if start else \
+            datetime.combine(fields.Date.today() - timedelta(days=3 * 365), datetime.min.time())
+
+        event_types, categories = self._generate_event_types(rng)
+        hall_records = self._generate_halls(rng, halls)
+        dishes = self._generate_dishes(rng, dish_count)
+        packages = self._generate_packages(rng, package_count, categories, dishes)
+        amenities = self._generate_amenities(rng, amenity_count)
+        self.env.flush_all()
+        booking_ids = self._generate_bookings(
+            rng, bookings, days, start, categories, hall_records, dishes, packages, amenities)
+        _logger.info("Generated %s bookings on %s halls", len(booking_ids), len(hall_records))
+        return {
+            'event_type_ids': event_types.ids,
+            'category_ids': categories.ids,
+            'hall_ids': hall_records.ids,
+            'dish_ids': dishes.ids,
+            'package_ids': packages.ids,
+            'amenity_ids': amenities.ids,
+            'booking_count': len(booking_ids),
+            'first_booking_id': booking_ids[0] if booking_ids else False,
+            'last_booking_id': booking_ids[-1] if booking_ids else False,
+        }
+
+    # ==================== CATALOG ====================
+
+    @api.model
+    def _generate_event_types(self, rng):
+        # Event type codes are unique, so a second run reuses the types of the first
+        codes = [f'G{code}' for _name, code in EVENT_TYPES]
+        EventType = self.env['event.type']
+        existing = set(EventType.search([('code', 'in', codes)]).mapped('code'))
+        EventType.create([
+            {'name': f'Generated {name}', 'code': f'G{code}'}
+            for name, code in EVENT_TYPES if f'G{code}' not in existing
+        ])
+        event_types = EventType.search([('code', 'in', codes)], order='id')
+        categories = self.env['event.category'].create([
+            {'name': f'Generated {event_type.name} {tier}', 'event_type_id': event_type.id}
+            for event_type in event_types
+            for tier in ('Basic', 'Standard', 'Premium', 'Royal')
+        ])
+        return event_types, categories
+
+    @api.model
+    def _generate_halls(self, rng, count):
+        return self.env['event.hall'].create([{
+            'name': f'Generated Hall {i}',
+            'capacity': rng.randrange(50, 2001, 50),
+            'chairs': rng.randrange(50, 2001, 50),
+            'tables': rng.randrange(5, 201),
+            'facilities': rng.choice(('ac', 'parking', 'stage', 'sound', 'wifi')),
+        } for i in range(count)])
+
+    @api.model
+    def _generate_dishes(self, rng, count):
+        dish_categories = self.env['dish.category'].create([
+            {'name': f'Generated Tier {i}', 'price': 50 + 50 * i} for i in range(10)
+        ])
+        return self.env['menu.dishes'].create([{
+            'name': f'Generated Dish {i}',
+            'dish_category_id': rng.choice(dish_categories).id,
+            'meal_type': rng.choice(MEAL_TYPES),
+            'meat_type': rng.choice(DISH_MEAT_TYPES),
+            'dish_category': rng.choice(DISH_CATEGORIES),
+            'is_spicy': rng.random() < 0.3,
+            'preparation_time': rng.randrange(10, 180),
+        } for i in range(count)])
+
+    @api.model
+    def _generate_packages(self, rng, count, categories, dishes):
+        dish_ids = dishes.ids
+
+        def pick(low, high):
+            return [(6, 0, rng.sample(dish_ids, min(len(dish_ids), rng.randint(low, high))))]
+
+        return self.env['menu.meal'].create([{
+            'name': f'Generated Package {i}',
+            'event_category_id': rng.choice(categories).id,
+            'meat_type': rng.choice(MEAT_TYPES),
+            'meat_dishes': pick(1, 3),
+            'rice_dish_ids': pick(1, 2),
+            'dessert_ids': pick(1, 2),
+            'salad_ids': pick(0, 2),
+            'drink_ids': pick(1, 2),
+            'bread_ids': pick(0, 1),
+        } for i in range(count)])
+
+    @api.model
+    def _generate_amenities(self, rng, count):
+        return self.env['event.amenity'].create([{
+            'name': f'Generated Amenity {i}',
+            'type': rng.choice(AMENITY_TYPES),
+            'price': rng.randrange(500, 50001, 500),
+        } for i in range(count)])
+
+    # ==================== BOOKINGS ====================
+
+    @api.model
+    def _generate_bookings(self, rng, count, days, start, categories, halls, dishes, packages, amenities):
+        """Insert count bookings with SQL, chunk by chunk, and return their ids"""
+        Booking = self.env['event.booking']
+        per_hall = max(count // max(len(halls), 1), 1)
+        step = timedelta(days=days) / per_hall
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        dish_ids, package_ids, amenity_ids = dishes.ids, packages.ids, amenities.ids
+        category_types = {category.id: category.event_type_id for category in categories}
+
+        # Every hall walks forward in time so its bookings never overlap
+        cursors = {hall.id: start for hall in halls}
+        capacities = {hall.id: hall.capacity or 100 for hall in halls}
+        hall_ids = halls.ids
+
+        booking_ids = []
+        for chunk in split_every(GENERATOR_CHUNK_SIZE, range(count), list):
+            rows = []
+            for i in chunk:
+                hall_id = hall_ids[i % len(hall_ids)]
+                slot_start = cursors[hall_id] + step * rng.uniform(0.0, 0.2)
+                duration = min(step * rng.uniform(0.3, 0.75), timedelta(hours=8))
+                duration = max(duration, timedelta(minutes=30))
+                cursors[hall_id] = max(cursors[hall_id] + step, slot_start + duration)
+                category_id = rng.choice(categories).id
+                rows.append({
+                    'name': f'Generated Customer {i}',
+                    'phone': f'+92{rng.randrange(10 ** 9, 10 ** 10)}',
+                    'start_time': slot_start.replace(microsecond=0),
+                    'end_time': (slot_start + duration).replace(microsecond=0),
+                    'booking_date': slot_start.date(),
+                    'event_type_id': category_types[category_id].id,
+                    'event_category_id': category_id,
+                    'hall_id': hall_id,
+                    'status': rng.choices(statuses, weights)[0],
+                    'total_person': rng.randint(20, capacities[hall_id]),
+                    'meat_type_filter': rng.choice(MEAT_TYPES + (None,)),
+                    'dishes': rng.sample(dish_ids, rng.randint(0, min(6, len(dish_ids)))),
+                    'packages': rng.sample(package_ids, rng.randint(0, min(2, len(package_ids)))),
+                    'amenities': rng.sample(amenity_ids, rng.randint(0, min(3, len(amenity_ids)))),
+                })
+            Booking._assign_references(rows)
+            chunk_ids = self._insert_booking_rows(rows)
+            Booking.browse(chunk_ids)._recompute_price_totals_sql()
+            booking_ids.extend(chunk_ids)
+            self.env.invalidate_all()
+            _logger.info("Generated %s bookings", len(booking_ids))
+        self.env.cr.execute("ANALYZE event_booking")
+        return booking_ids
+
+    @api.model
+    def _insert_booking_rows(self, rows):
+        """Insert booking rows and their many2many relations, returns the new ids in row order"""
+        cr = self.env.cr
+        cr.execute(SQL(
+            """INSERT INTO event_booking (reference, name, phone, start_time, end_time, booking_date,
+                                          event_type_id, event_category_id, hall_id, status,
+                                          total_person, meat_type_filter,
+                                          create_uid, create_date, write_uid, write_date)
+               VALUES %s RETURNING id""",
+            SQL(", ").join(
+                SQL("(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                    row['reference'], row['name'], row['phone'], row['start_time'], row['end_time'],
+                    row['booking_date'], row['event_type_id'], row['event_category_id'],
+                    row['hall_id'], row['status'], row['total_person'], row['meat_type_filter'],
+                    self.env.uid, SQL("now() at time zone 'UTC'"),
+                    self.env.uid, SQL("now() at time zone 'UTC'"))
+                for row in rows),
+        ))
+        # RETURNING follows the VALUES order for a plain INSERT
+        ids = [row[0] for row in cr.fetchall()]
+
+        Booking = self.env['event.booking']
+        for fname, key in (('selected_dishes', 'dishes'), ('selected_meal_packages', 'packages'),
+                           ('amenities', 'amenities')):
+            field = Booking._fields[fname]
+            pairs = [(booking_id, other_id) for booking_id, row in zip(ids, rows) for other_id in row[key]]
+            for pair_chunk in split_every(GENERATOR_CHUNK_SIZE, pairs):
+                cr.execute(SQL(
+                    "INSERT INTO %s (%s, %s) VALUES %s ON CONFLICT DO NOTHING",
+                    SQL.identifier(field.relation), SQL.identifier(field.column1),
+                    SQL.identifier(field.column2),
+                    SQL(", ").join(SQL("(%s, %s)", *pair) for pair in pair_chunk),
+                ))
+        return ids
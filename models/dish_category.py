@@ -21,6 +21,13 @@ class DishCategory(models.Model):
         for record in self:
             record.dish_count = len(record.dish_ids)
     
+    def write(self, vals):
+        res = super().write(vals)
+        if 'price' in vals:
+            # Fast path: refresh dependent booking totals in one SQL pass
+            self.env['event.booking']._recompute_pending_price_totals()
+        return res
+
     def action_view_dishes(self):
         return {
             'name': 'Dishes',
@@ -8,6 +8,10 @@ class EventType(models.Model):
     code = fields.Char('Code', required=True, help='Code for sequence generation (e.g., WED, CONF)')
     category_ids = fields.One2many('event.category', 'event_type_id', string='Categories')
 
+    _sql_constraints = [
+        ('code_uniq', 'unique(code)', 'The event type code must be unique.'),
+    ]
+
 class EventCategory(models.Model):
     _name = 'event.category'
     _description = 'Event Category'
@@ -1,11 +1,19 @@
-from odoo import models, fields
+from bisect import bisect_left
+from collections import defaultdict
+
+from odoo import models, fields, api, tools
+
+from .table_version import table_version
+
 
 class EventHall(models.Model):
     _name = 'event.hall'
     _description = 'Event Hall'
 
     name = fields.Char('Hall Name', required=True)
-    image = fields.Binary('Image')
+    image = fields.Image('Image', max_width=1920, max_height=1920)
+    image_512 = fields.Image('Image 512', related='image', max_width=512, max_height=512, store=True)
+    image_128 = fields.Image('Image 128', related='image', max_width=128, max_height=128, store=True)
     capacity = fields.Integer('Capacity')
     chairs = fields.Integer('Number of Chairs')
     tables = fields.Integer('Number of Tables')
@@ -15,4 +23,86 @@ class EventHall(models.Model):
         ('stage', 'Stage'),
         ('sound', 'Sound System'),
         ('wifi', 'WiFi')
-    ], string='Facilities')
\ No newline at end of file
+    ], string='Facilities')
+
+    # ==================== CAPACITY INDEX ====================
+
+    @api.model
+    def _get_capacity_index(self):
+        """Return (capacities, hall_ids), both sorted by capacity then id.
+
+        Cached in the registry, keyed on the version of the event_hall
+        table so created, removed and modified halls are picked up.
+        """
+        return self._build_capacity_index(table_version(self.env, 'event.hall'))
+
+    @api.model
+    @tools.ormcache('version')
+    def _build_capacity_index(self, version):
+        halls = self.sudo().search_read([], ['capacity'], order='capacity asc, id asc')
+        return (
+            tuple(hall['capacity'] or 0 for hall in halls),
+            tuple(hall['id'] for hall in halls),
+        )
+
+    @api.model
+    def _get_halls_for_capacity(self, total_person):
+        """Return the ids of halls seating at least total_person, smallest first"""
+        capacities, hall_ids = self._get_capacity_index()
+        return hall_ids[bisect_left(capacities, total_person or 0):]
+
+    @api.model
+    def _get_busy_slots(self, hall_ids, start, end, exclude_booking_ids=()):
+        """Return {hall_id: [(start, end)]} of confirmed bookings and live holds in [start, end)"""
+        if not hall_ids:
+            return {}
+        self.env['event.booking'].flush_model(
+            ['hall_id', 'start_time', 'end_time', 'status', 'hold_expires_at'])
+        self.env.cr.execute("""
+            SELECT hall_id, start_time, end_time
+              FROM event_booking
+             WHERE (status = 'confirmed'
+                    OR (status = 'hold' AND hold_expires_at > (now() at time zone 'UTC')))
+               AND hall_id = ANY(%s)
+               AND id != ALL(%s)
+               AND end_time > %s
+               AND tsrange(start_time, end_time) && tsrange(%s, %s)
+        """, [list(hall_ids), list(exclude_booking_ids), start, start, end])
+        busy = defaultdict(list)
+        for hall_id, slot_start, slot_end in self.env.cr.fetchall():
+            busy[hall_id].append((slot_start, slot_end))
+        return busy
+
+    # ==================== HALL SUGGESTION API ====================
+
+    @api.model
+    def suggest(self, total_person, start=None, end=None, booking_id=None):
+        """Suggest the smallest hall that seats total_person and is free in [start, end).
+
+        Returns {'id', 'name', 'capacity'} or False.  booking_id, when given,
+        is ignored in the busy check so a booking doesn't block itself.
+        """
+        hall_ids = self._get_halls_for_capacity(total_person)
+        if start and end:
+            busy = self._get_busy_slots(
+                hall_ids, fields.Datetime.to_datetime(start), fields.Datetime.to_datetime(end),
+                [booking_id] if booking_id else [])
+            hall_ids = [hall_id for hall_id in hall_ids if hall_id not in busy]
+        if not hall_ids:
+            return False
+        hall = self.browse(hall_ids[0])
+        return {'id': hall.id, 'name': hall.name, 'capacity': hall.capacity}
+
+    @api.model
+    def assign_halls(self, booking_ids):
+        """Assign a free hall to each of the given draft bookings in one call.
+
+        The halls are planned together by propose_schedule(), so large
+        parties are not crowded out of the big halls and few seats stay
+        empty.  Returns {booking_id: hall_id or False}.
+        """
+        proposal = self.propose_schedule(booking_ids)
+        self._apply_schedule(proposal['assignment'])
+        assignment = dict(proposal['assignment'])
+        assignment.update(dict.fromkeys(proposal['unplaced'], False))
+        return assignment
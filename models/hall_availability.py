@@ -0,0 +1,235 @@
+import json
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL, split_every
+
+# Booking fields that move a confirmed booking on the availability calendar
+AVAILABILITY_FIELDS = ('status', 'hall_id', 'start_time', 'end_time')
+
+
+class EventHallAvailability(models.Model):
+    _inherit = 'event.hall'
+
+    # ==================== DATABASE SETUP ====================
+
+    def init(self):
+        """Create the per (hall, day) cache of merged busy intervals.
+
+        busy holds [start, end] pairs in minutes since midnight (UTC).  A
+        row with an empty list means the day was computed and is free.
+        """
+        super().init()
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS event_hall_busy_cache (
+                hall_id integer NOT NULL REFERENCES event_hall(id) ON DELETE CASCADE,
+                day date NOT NULL,
+                busy jsonb NOT NULL,
+                PRIMARY KEY (hall_id, day)
+            )
+        """)
+
+    # ==================== AVAILABILITY API ====================
+
+    @api.model
+    def get_availability(self, date_from, date_to, hall_ids=None, granularity='interval'):
+        """Return the busy time of halls between date_from and date_to (inclusive).
+
+        Days are UTC days.  With granularity 'interval' every hall maps to a
+        flat list of [day_offset, start_minute, end_minute] triples of merged
+        busy intervals.  With a number of minutes (e.g. 30 or 60) every hall
+        maps to {day_offset: '0110...'}, one character per slot, listing only
+        days that have busy slots.
+        """
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if date_to < date_from:
+            raise ValidationError("date_to must not be before date_from")
+        if granularity != 'interval' and (not isinstance(granularity, int) or
+                                          granularity <= 0 or 1440 % granularity):
+            raise ValidationError("granularity must be 'interval' or a divisor of 1440 minutes")
+        hall_ids = list(hall_ids) if hall_ids else self.search([]).ids
+
+        busy_by_day = self._get_busy_days(hall_ids, date_from, date_to)
+        halls = {}
+        for hall_id in hall_ids:
+            days = busy_by_day.get(hall_id, {})
+            if granularity == 'interval':
+                halls[hall_id] = [
+                    [(day - date_from).days, start, end]
+                    for day in sorted(days)
+                    for start, end in days[day]
+                ]
+            else:
+                slots = 1440 // granularity
+                halls[hall_id] = {
+                    (day - date_from).days: ''.join(
+                        '1' if any(start < (slot + 1) * granularity and slot * granularity < end
+                                   for start, end in days[day]) else '0'
+                        for slot in range(slots))
+                    for day in sorted(days) if days[day]
+                }
+        return {
+            'date_from': fields.Date.to_string(date_from),
+            'date_to': fields.Date.to_string(date_to),
+            'granularity': granularity,
+            'halls': halls,
+        }
+
+    # ==================== CACHE ====================
+
+    @api.model
+    def _get_busy_days(self, hall_ids, date_from, date_to):
+        """Return {hall_id: {day: [[start, end], ...]}}, filling cache misses from SQL"""
+        cr = self.env.cr
+        cr.execute("""
+            SELECT hall_id, day, busy FROM event_hall_busy_cache
+             WHERE hall_id = ANY(%s) AND day BETWEEN %s AND %s
+        """, [hall_ids, date_from, date_to])
+        result = defaultdict(dict)
+        for hall_id, day, busy in cr.fetchall():
+            result[hall_id][day] = busy
+
+        day_count = (date_to - date_from).days + 1
+        missing_halls = [hall_id for hall_id in hall_ids if len(result.get(hall_id, ())) < day_count]
+        if missing_halls:
+            computed = self._compute_busy_days(missing_halls, date_from, date_to)
+            rows = []
+            for hall_id in missing_halls:
+                for offset in range(day_count):
+                    day = date_from + timedelta(days=offset)
+                    if day not in result[hall_id]:
+                        busy = computed.get((hall_id, day), [])
+                        result[hall_id][day] = busy
+                        rows.append((hall_id, day, json.dumps(busy)))
+            # Concurrent refreshes from booking changes win over this fill
+            self._write_busy_rows(rows, overwrite=False)
+        return result
+
+    @api.model
+    def _compute_busy_days(self, hall_ids, date_from, date_to):
+        """Merge the confirmed bookings of the halls into busy intervals per day, in SQL.
+
+        Returns {(hall_id, day): [[start_minute, end_minute], ...]}.
+        """
+        self.env['event.booking'].flush_model(AVAILABILITY_FIELDS)
+        self.env.cr.execute("""
+            WITH days AS (
+                SELECT d::date AS day
+                  FROM generate_series(%(date_from)s::date, %(date_to)s::date, interval '1 day') AS d
+            ), pieces AS (
+                SELECT b.hall_id, days.day,
+                       GREATEST(b.start_time, days.day::timestamp) AS piece_start,
+                       LEAST(b.end_time, days.day::timestamp + interval '1 day') AS piece_end
+                  FROM event_booking b
+                  JOIN days ON tsrange(b.start_time, b.end_time)
+                               && tsrange(days.day::timestamp, days.day::timestamp + interval '1 day')
+                 WHERE b.status = 'confirmed'
+                   AND b.hall_id = ANY(%(hall_ids)s)
+                   AND b.end_time > %(date_from)s::timestamp
+                   AND tsrange(b.start_time, b.end_time)
+                       && tsrange(%(date_from)s::timestamp, %(date_to)s::timestamp + interval '1 day')
+            ), marked AS (
+                SELECT *,
+                       CASE WHEN piece_start <= MAX(piece_end) OVER (
+                                PARTITION BY hall_id, day ORDER BY piece_start, piece_end
+                                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+                            THEN 0 ELSE 1 END AS starts_group
+                  FROM pieces
+            ), grouped AS (
+                SELECT *,
+                       SUM(starts_group) OVER (
+                           PARTITION BY hall_id, day ORDER BY piece_start, piece_end) AS grp
+                  FROM marked
+            )
+            SELECT hall_id, day,
+                   EXTRACT(EPOCH FROM MIN(piece_start) - day::timestamp)::integer / 60,
+                   EXTRACT(EPOCH FROM MAX(piece_end) - day::timestamp)::integer / 60
+              FROM grouped
+             GROUP BY hall_id, day, grp
+             ORDER BY hall_id, day, 3
+        """, {'hall_ids': list(hall_ids), 'date_from': date_from, 'date_to': date_to})
+        result = defaultdict(list)
+        for hall_id, day, start, end in self.env.cr.fetchall():
+            result[(hall_id, day)].append([start, end])
+        return result
+
+    @api.model
+    def _refresh_availability_cache(self, hall_days):
+        """Recompute the cached rows of the given {hall_id: {day, ...}} after a booking change.
+
+        Rows are overwritten rather than deleted, so a concurrent reader
+        filling the same day from an older snapshot cannot leave a stale
+        row behind.
+        """
+        rows = []
+        for hall_id, days in hall_days.items():
+            if not days:
+                continue
+            computed = self._compute_busy_days([hall_id], min(days), max(days))
+            rows.extend((hall_id, day, json.dumps(computed.get((hall_id, day), []))) for day in days)
+        self._write_busy_rows(rows, overwrite=True)
+
+    @api.model
+    def _write_busy_rows(self, rows, overwrite):
+        """Insert (hall_id, day, busy_json) rows into the cache, 1000 per statement"""
+        on_conflict = SQL("DO UPDATE SET busy = EXCLUDED.busy") if overwrite else SQL("DO NOTHING")
+        for chunk in split_every(1000, rows):
+            self.env.cr.execute(SQL(
+                "INSERT INTO event_hall_busy_cache (hall_id, day, busy) VALUES %s "
+                "ON CONFLICT (hall_id, day) %s",
+                SQL(", ").join(SQL("(%s, %s, %s::jsonb)", *row) for row in chunk),
+                on_conflict,
+            ))
+
+
+class EventBookingAvailability(models.Model):
+    _inherit = 'event.booking'
+
+    def _get_busy_hall_days(self):
+        """Return {hall_id: {day, ...}} covered by the confirmed bookings of the recordset"""
+        hall_days = defaultdict(set)
+        for booking in self:
+            if booking.status != 'confirmed' or not booking.hall_id \
+                    or not booking.start_time or not booking.end_time:
+                continue
+            day = booking.start_time.date()
+            last_day = (booking.end_time - timedelta(microseconds=1)).date()
+            while day <= last_day:
+                hall_days[booking.hall_id.id].add(day)
+                day += timedelta(days=1)
+        return hall_days
+
+    def _merge_hall_days(self, *hall_days_list):
+        merged = defaultdict(set)
+        for hall_days in hall_days_list:
+            for hall_id, days in hall_days.items():
+                merged[hall_id] |= days
+        return merged
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        hall_days = records._get_busy_hall_days()
+        if hall_days:
+            self.env['event.hall']._refresh_availability_cache(hall_days)
+        return records
+
+    def write(self, vals):
+        if not any(name in vals for name in AVAILABILITY_FIELDS):
+            return super().write(vals)
+        before = self._get_busy_hall_days()
+        res = super().write(vals)
+        hall_days = self._merge_hall_days(before, self._get_busy_hall_days())
+        if hall_days:
+            self.env['event.hall']._refresh_availability_cache(hall_days)
+        return res
+
+    def unlink(self):
+        hall_days = self._get_busy_hall_days()
+        res = super().unlink()
+        if hall_days:
+            self.env['event.hall']._refresh_availability_cache(hall_days)
+        return res
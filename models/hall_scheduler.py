@@ -0,0 +1,280 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+# How many bookings a placement may push to another hall, see plan_halls()
+EJECTION_DEPTH = 2
+IMPROVE_ROUNDS = 5
+
+_start = itemgetter(0)
+
+
+def _merge_slots(intervals):
+    """Return fixed (start, end, None) slots with overlapping intervals merged"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end), None)
+        else:
+            merged.append((start, end, None))
+    return merged
+
+
+def plan_halls(bookings, halls, busy=None, depth=EJECTION_DEPTH):
+    """Assign halls to bookings: no overlaps, as many placed as possible, least empty seats.
+
+    bookings is a list of (booking_id, persons, start, end), halls a list
+    of (hall_id, capacity) and busy maps hall_id to fixed [(start, end)]
+    slots (confirmed bookings, holds).  Returns (assignment, unplaced):
+    {booking_id: hall_id} and the ids that fit nowhere.
+
+    Waste is the sum of capacity - persons over the placed bookings, so
+    for a given set of placed bookings it only depends on the halls used.
+    Bookings are seated largest party first in the smallest free hall
+    that fits.  A booking that finds no free hall may push one
+    conflicting booking to another hall, recursively up to `depth`
+    moves.  Then bookings are moved to smaller halls, directly or by
+    pushing one booking to a hall smaller than the one freed, for at most
+    IMPROVE_ROUNDS rounds, stopping early once a round lowers nothing.
+
+    This is a heuristic: the result is never worse than the greedy
+    placement, but neither the number of placed bookings nor the waste
+    is guaranteed to be minimal.
+    """
+    halls = sorted(halls, key=lambda hall: (hall[1] or 0, hall[0]))
+    capacities = [hall[1] or 0 for hall in halls]
+    capacity_of = {hall_id: capacity or 0 for hall_id, capacity in halls}
+    info = {booking[0]: booking for booking in bookings}
+    # Per hall, its slots sorted by start; they never overlap, so they are
+    # sorted by end too.  booking_id None marks a fixed slot.
+    slots = {hall_id: _merge_slots((busy or {}).get(hall_id, ())) for hall_id, _capacity in halls}
+    assignment = {}
+
+    def eligible(booking_id):
+        persons = info[booking_id][1] or 0
+        return [hall[0] for hall in halls[bisect_left(capacities, persons):]]
+
+    def conflicts(hall_id, start, end):
+        """Return up to two slots of the hall overlapping [start, end)"""
+        hall_slots = slots[hall_id]
+        index = bisect_left(hall_slots, end, key=_start)
+        found = []
+        while index > 0 and hall_slots[index - 1][1] > start and len(found) < 2:
+            index -= 1
+            found.append(hall_slots[index])
+        return found
+
+    def put(booking_id, hall_id):
+        _booking_id, _persons, start, end = info[booking_id]
+        hall_slots = slots[hall_id]
+        hall_slots.insert(bisect_left(hall_slots, start, key=_start), (start, end, booking_id))
+        assignment[booking_id] = hall_id
+
+    def take(booking_id):
+        hall_id = assignment.pop(booking_id)
+        _booking_id, _persons, start, end = info[booking_id]
+        slots[hall_id].remove((start, end, booking_id))
+        return hall_id
+
+    def place(booking_id, depth, moving, halls_allowed=None):
+        """Seat booking_id, pushing others if needed; leaves everything as it was on failure"""
+        _booking_id, _persons, start, end = info[booking_id]
+        candidates = [hall_id for hall_id in eligible(booking_id)
+                      if halls_allowed is None or hall_id in halls_allowed]
+        blocked = []
+        for hall_id in candidates:
+            blocking = conflicts(hall_id, start, end)
+            if not blocking:
+                put(booking_id, hall_id)
+                return True
+            if len(blocking) == 1 and blocking[0][2] is not None and blocking[0][2] not in moving:
+                blocked.append((hall_id, blocking[0][2]))
+        if depth <= 0:
+            return False
+        for hall_id, other in blocked:
+            take(other)
+            put(booking_id, hall_id)
+            if place(other, depth - 1, moving | {booking_id}):
+                return True
+            take(booking_id)
+            put(other, hall_id)
+        return False
+
+    order = sorted(info, key=lambda booking_id: (-(info[booking_id][1] or 0), info[booking_id][2], booking_id))
+    unplaced = [booking_id for booking_id in order if not place(booking_id, 0, frozenset())]
+    unplaced = [booking_id for booking_id in unplaced if not place(booking_id, depth, frozenset())]
+
+    for _round in range(IMPROVE_ROUNDS):
+        improved = False
+        for booking_id in sorted(assignment, key=lambda b: capacity_of[assignment[b]] - (info[b][1] or 0),
+                                 reverse=True):
+            current = assignment[booking_id]
+            smaller = {hall_id for hall_id in eligible(booking_id)
+                       if capacity_of[hall_id] < capacity_of[current]}
+            if not smaller:
+                continue
+            take(booking_id)
+            if place(booking_id, 0, frozenset(), smaller):
+                improved = True
+                continue
+            # Push one booking out of a smaller hall, into a hall smaller than the one freed
+            moved = False
+            _booking_id, _persons, start, end = info[booking_id]
+            for hall_id in sorted(smaller, key=capacity_of.get):
+                blocking = conflicts(hall_id, start, end)
+                if len(blocking) != 1 or blocking[0][2] is None:
+                    continue
+                other = blocking[0][2]
+                take(other)
+                put(booking_id, hall_id)
+                target = {h for h in eligible(other) if capacity_of[h] < capacity_of[current]}
+                if place(other, 0, frozenset(), target):
+                    moved = True
+                    break
+                take(booking_id)
+                put(other, hall_id)
+            if moved:
+                improved = True
+            else:
+                put(booking_id, current)
+        if not improved:
+            break
+    return assignment, unplaced
+
+
+def schedule_waste(assignment, persons, capacities):
+    """Empty seats of an assignment: sum of capacity - persons"""
+    return sum((capacities.get(hall_id) or 0) - (persons.get(booking_id) or 0)
+               for booking_id, hall_id in assignment.items())
+
+
+class EventHallScheduler(models.Model):
+    _inherit = 'event.hall'
+
+    @api.model
+    def propose_schedule(self, booking_ids):
+        """Plan halls for the given draft bookings, around confirmed bookings and holds.
+
+        Returns {'assignment': {booking_id: hall_id}, 'unplaced': [booking_id],
+        'waste': empty seats of the proposal, 'current_waste': of the
+        current halls, 'ms': solver time}.
+        """
+        bookings = self.env['event.booking'].browse(booking_ids).filtered(
+            lambda booking: booking.status == 'draft' and booking.start_time and booking.end_time
+            and booking.start_time < booking.end_time)
+        if not bookings:
+            return {'assignment': {}, 'unplaced': [], 'waste': 0, 'current_waste': 0, 'ms': 0.0}
+        hall_records = self.search([])
+        halls = [(hall.id, hall.capacity) for hall in hall_records]
+        busy = self._get_busy_slots(
+            hall_records.ids, min(bookings.mapped('start_time')), max(bookings.mapped('end_time')),
+            bookings.ids)
+        rows = [(booking.id, booking.total_person, booking.start_time, booking.end_time)
+                for booking in bookings]
+
+        start = time.perf_counter()
+        assignment, unplaced = plan_halls(rows, halls, busy)
+        ms = round((time.perf_counter() - start) * 1000, 3)
+
+        persons = {booking.id: booking.total_person for booking in bookings}
+        capacities = dict(halls)
+        current = {booking.id: booking.hall_id.id for booking in bookings
+                   if booking.id not in unplaced and booking.hall_id}
+        return {
+            'assignment': assignment,
+            'unplaced': unplaced,
+            'waste': schedule_waste(assignment, persons, capacities),
+            'current_waste': schedule_waste(current, persons, capacities),
+            'ms': ms,
+        }
+
+    @api.model
+    def _apply_schedule(self, assignment):
+        """Write a {booking_id: hall_id} proposal, one write per hall"""
+        by_hall = defaultdict(list)
+        for booking_id, hall_id in assignment.items():
+            if hall_id:
+                by_hall[hall_id].append(booking_id)
+        for hall_id, ids in by_hall.items():
+            self.env['event.booking'].browse(ids).write({'hall_id': hall_id})
+
+
+class EventHallScheduleWizard(models.TransientModel):
+    _name = 'event.hall.schedule.wizard'
+    _description = 'Hall Schedule Proposal'
+
+    date_from = fields.Date('From', required=True, default=fields.Date.context_today)
+    date_to = fields.Date('To', required=True, default=fields.Date.context_today)
+    line_ids = fields.One2many('event.hall.schedule.line', 'wizard_id', string='Proposal')
+    placed_count = fields.Integer('Placed', readonly=True)
+    unplaced_count = fields.Integer('Not Placed', readonly=True)
+    current_waste = fields.Integer('Empty Seats Now', readonly=True)
+    proposed_waste = fields.Integer('Empty Seats Proposed', readonly=True)
+    solve_ms = fields.Float('Solver Time (ms)', readonly=True)
+
+    def _get_draft_bookings(self):
+        self.ensure_one()
+        if self.date_to < self.date_from:
+            raise UserError("The end date must not be before the start date.")
+        return self.env['event.booking'].search([
+            ('status', '=', 'draft'),
+            ('start_time', '<', datetime.combine(self.date_to + timedelta(days=1), datetime.min.time())),
+            ('end_time', '>', datetime.combine(self.date_from, datetime.min.time())),
+        ])
+
+    def action_compute(self):
+        """Compute a proposal for the draft bookings of the period and show it"""
+        self.ensure_one()
+        bookings = self._get_draft_bookings()
+        proposal = self.env['event.hall'].propose_schedule(bookings.ids)
+        assignment = proposal['assignment']
+        self.line_ids.unlink()
+        self.write({
+            'line_ids': [(0, 0, {
+                'booking_id': booking.id,
+                'current_hall_id': booking.hall_id.id,
+                'proposed_hall_id': assignment.get(booking.id, False),
+            }) for booking in bookings],
+            'placed_count': len(assignment),
+            'unplaced_count': len(proposal['unplaced']),
+            'current_waste': proposal['current_waste'],
+            'proposed_waste': proposal['waste'],
+            'solve_ms': proposal['ms'],
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_apply(self):
+        """Move every placed booking to its proposed hall"""
+        self.ensure_one()
+        self.env['event.hall']._apply_schedule({
+            line.booking_id.id: line.proposed_hall_id.id
+            for line in self.line_ids
+            if line.proposed_hall_id and line.proposed_hall_id != line.current_hall_id
+        })
+        return {'type': 'ir.actions.act_window_close'}
+
+
+class EventHallScheduleLine(models.TransientModel):
+    _name = 'event.hall.schedule.line'
+    _description = 'Hall Schedule Proposal Line'
+    _order = 'start_time, id'
+
+    wizard_id = fields.Many2one('event.hall.schedule.wizard', required=True, ondelete='cascade')
+    booking_id = fields.Many2one('event.booking', string='Booking', required=True, ondelete='cascade')
+    start_time = fields.Datetime(related='booking_id.start_time', store=True)
+    end_time = fields.Datetime(related='booking_id.end_time')
+    total_person = fields.Integer(related='booking_id.total_person')
+    current_hall_id = fields.Many2one('event.hall', string='Current Hall')
+    proposed_hall_id = fields.Many2one('event.hall', string='Proposed Hall')
+    proposed_capacity = fields.Integer(related='proposed_hall_id.capacity', string='Capacity')
@@ -0,0 +1,192 @@
+import logging
+from datetime import datetime, timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+from .menu_meal import DISH_RELATIONS
+
+_logger = logging.getLogger(__name__)
+
+# Booking fields that change what the kitchen cooks for a confirmed booking
+KITCHEN_FIELDS = ('status', 'start_time', 'total_person', 'selected_dishes', 'selected_meal_packages')
+# First key of the per-day advisory locks; hall locks use positive hall ids
+KITCHEN_LOCK_KEY = -1
+
+
+class EventKitchenPlan(models.Model):
+    _name = 'event.kitchen.plan'
+    _description = 'Kitchen Production Plan'
+    _order = 'day, dish_id'
+    _rec_name = 'dish_id'
+    _log_access = False
+
+    # One row per event day and dish: the portions to cook for all
+    # confirmed bookings of that day.  A booking needs total_person portions
+    # of every selected dish and of every dish of its selected meal
+    # packages.  Days are kept up to date as bookings are confirmed,
+    # cancelled or changed; action_generate rebuilds from today on.
+
+    day = fields.Date('Day', readonly=True, index=True)
+    dish_id = fields.Many2one('menu.dishes', string='Dish', readonly=True, index=True)
+    portions = fields.Integer('Portions', readonly=True, aggregator='sum')
+    booking_count = fields.Integer('Bookings', readonly=True, aggregator='sum')
+    preparation_time = fields.Integer('Preparation Time (minutes)', readonly=True, aggregator='sum',
+                                      help='Preparation time of the dish, once per booking and menu line')
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS event_kitchen_plan_day_dish_uniq
+                ON event_kitchen_plan (day, dish_id)
+        """)
+
+    # ==================== REFRESH ====================
+
+    @api.model
+    def _refresh_days(self, days):
+        """Rebuild the rows of the given event days with one set-based pass"""
+        days = sorted(day for day in set(days) if day)
+        if not days:
+            return
+        Booking = self.env['event.booking']
+        Meal = self.env['menu.meal']
+        Booking.flush_model(['status', 'start_time', 'total_person', 'selected_dishes',
+                             'selected_meal_packages'])
+        Meal.flush_model(['active'] + list(DISH_RELATIONS))
+        self.env['menu.dishes'].flush_model(['active', 'preparation_time'])
+
+        dishes = Booking._fields['selected_dishes']
+        meals = Booking._fields['selected_meal_packages']
+        # A dish listed in several courses of a package is cooked once for it
+        package_dishes = SQL(" UNION ").join(
+            SQL("SELECT %s AS meal_id, %s AS dish_id FROM %s",
+                SQL.identifier(Meal._fields[relation].column1),
+                SQL.identifier(Meal._fields[relation].column2),
+                SQL.identifier(Meal._fields[relation].relation))
+            for relation in DISH_RELATIONS
+        )
+        cr = self.env.cr
+        # Concurrent refreshes of a day run one after the other, so the
+        # second one sees the first one's bookings and rows
+        cr.execute("""
+            SELECT pg_advisory_xact_lock(%s, d.day)
+              FROM (SELECT unnest(%s::int[]) AS day ORDER BY 1 OFFSET 0) d
+        """, [KITCHEN_LOCK_KEY, [day.toordinal() for day in days]])
+        cr.execute("DELETE FROM event_kitchen_plan WHERE day = ANY(%s)", [days])
+        cr.execute(SQL("""
+            WITH bookings AS (
+                SELECT id, start_time::date AS day, COALESCE(total_person, 0) AS persons
+                  FROM event_booking
+                 WHERE status = 'confirmed'
+                   AND start_time >= %(first)s AND start_time < %(last)s
+                   AND start_time::date = ANY(%(days)s)
+            ), servings AS (
+                SELECT b.day, b.id AS booking_id, rel.%(d_other)s AS dish_id, b.persons
+                  FROM bookings b
+                  JOIN %(d_rel)s rel ON rel.%(d_booking)s = b.id
+                 UNION ALL
+                SELECT b.day, b.id, package.dish_id, b.persons
+                  FROM bookings b
+                  JOIN %(m_rel)s rel ON rel.%(m_booking)s = b.id
+                  JOIN menu_meal meal ON meal.id = rel.%(m_other)s AND meal.active
+                  JOIN (%(package_dishes)s) package ON package.meal_id = meal.id
+            )
+            INSERT INTO event_kitchen_plan (day, dish_id, portions, booking_count, preparation_time)
+            SELECT s.day, s.dish_id, SUM(s.persons), COUNT(DISTINCT s.booking_id),
+                   SUM(COALESCE(dish.preparation_time, 0))
+              FROM servings s
+              JOIN menu_dishes dish ON dish.id = s.dish_id AND dish.active
+             GROUP BY s.day, s.dish_id
+        """,
+            first=datetime.combine(days[0], datetime.min.time()),
+            last=datetime.combine(days[-1] + timedelta(days=1), datetime.min.time()),
+            days=days,
+            d_rel=SQL.identifier(dishes.relation),
+            d_booking=SQL.identifier(dishes.column1),
+            d_other=SQL.identifier(dishes.column2),
+            m_rel=SQL.identifier(meals.relation),
+            m_booking=SQL.identifier(meals.column1),
+            m_other=SQL.identifier(meals.column2),
+            package_dishes=package_dishes,
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def action_generate(self):
+        """Rebuild the plan of every day from today on and reload the view"""
+        plan = self.sudo()
+        today = fields.Date.today()
+        self.env['event.booking'].flush_model(['status', 'start_time'])
+        self.env.cr.execute("""
+            SELECT DISTINCT start_time::date FROM event_booking
+             WHERE status = 'confirmed' AND start_time >= %s
+             UNION
+            SELECT day FROM event_kitchen_plan WHERE day >= %s
+        """, [datetime.combine(today, datetime.min.time()), today])
+        days = [row[0] for row in self.env.cr.fetchall()]
+        plan._refresh_days(days)
+        _logger.info("Kitchen plan generated for %s days", len(days))
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
+
+
+class EventBookingKitchen(models.Model):
+    _inherit = 'event.booking'
+
+    def _get_kitchen_days(self):
+        """Return the event days of the confirmed bookings of the recordset"""
+        return {booking.start_time.date() for booking in self
+                if booking.status == 'confirmed' and booking.start_time}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        days = records._get_kitchen_days()
+        if days:
+            self.env['event.kitchen.plan'].sudo()._refresh_days(days)
+        return records
+
+    def write(self, vals):
+        if not any(name in vals for name in KITCHEN_FIELDS):
+            return super().write(vals)
+        before = self._get_kitchen_days()
+        res = super().write(vals)
+        days = before | self._get_kitchen_days()
+        if days:
+            self.env['event.kitchen.plan'].sudo()._refresh_days(days)
+        return res
+
+    def unlink(self):
+        days = self._get_kitchen_days()
+        res = super().unlink()
+        if days:
+            self.env['event.kitchen.plan'].sudo()._refresh_days(days)
+        return res
+
+
+class MenuMealKitchen(models.Model):
+    _inherit = 'menu.meal'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(name in vals for name in DISH_RELATIONS + ('active',)):
+            # Upcoming confirmed bookings serving these packages cook differently now
+            self.env['event.booking'].flush_model(['status', 'start_time', 'selected_meal_packages'])
+            meals = self.env['event.booking']._fields['selected_meal_packages']
+            self.env.cr.execute(SQL("""
+                SELECT DISTINCT b.start_time::date
+                  FROM event_booking b
+                  JOIN %(rel)s rel ON rel.%(booking)s = b.id
+                 WHERE rel.%(meal)s = ANY(%(ids)s)
+                   AND b.status = 'confirmed'
+                   AND b.start_time >= %(today)s
+            """,
+                rel=SQL.identifier(meals.relation),
+                booking=SQL.identifier(meals.column1),
+                meal=SQL.identifier(meals.column2),
+                ids=self.ids,
+                today=datetime.combine(fields.Date.today(), datetime.min.time()),
+            ))
+            days = [row[0] for row in self.env.cr.fetchall()]
+            if days:
+                self.env['event.kitchen.plan'].sudo()._refresh_days(days)
+        return res
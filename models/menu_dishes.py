@@ -1,16 +1,25 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 
 
 class MenuDishes(models.Model):
     _name = 'menu.dishes'
+    _inherit = ['event.catalog.search.mixin']
     _description = 'Menu Dishes'
     _order = 'meal_type, sequence, name'
 
-    name = fields.Char('Dish Name', required=True)
+    _catalog_fields = ('name', 'price', 'meal_type', 'meat_type', 'dish_category',
+                       'dish_category_id', 'is_vegetarian', 'is_spicy')
+    _catalog_filters = ('meal_type', 'meat_type', 'dish_category', 'dish_category_id',
+                        'is_vegetarian', 'is_spicy')
+    _catalog_image_field = 'image'
+
+    name = fields.Char('Dish Name', required=True, index='trigram')
     description = fields.Text('Description')
     dish_category_id = fields.Many2one('dish.category', string='Dish Category', required=True)
     price = fields.Float('Price', related='dish_category_id.price', store=True, readonly=True)
-    image = fields.Binary('Image')
+    image = fields.Image('Image', max_width=1920, max_height=1920)
+    image_512 = fields.Image('Image 512', related='image', max_width=512, max_height=512, store=True)
+    image_128 = fields.Image('Image 128', related='image', max_width=128, max_height=128, store=True)
     meal_type = fields.Selection([
         ('breakfast', 'Breakfast'),
         ('lunch', 'Lunch'),
@@ -47,6 +56,14 @@ class MenuDishes(models.Model):
     booking_ids = fields.Many2many('event.booking', 'booking_dishes_rel', 
                                    'dish_id', 'booking_id', string='Bookings')
     
+    def init(self):
+        # Catalog filters followed by the keyset order, for search_catalog
+        tools.create_index(self.env.cr, 'menu_dishes_catalog_idx', self._table,
+                           ['meal_type', 'meat_type', 'dish_category', 'name', 'id'],
+                           where='active')
+        tools.create_index(self.env.cr, 'menu_dishes_name_id_idx', self._table,
+                           ['name', 'id'], where='active')
+
     @api.onchange('meat_type')
     def _onchange_meat_type(self):
         if self.meat_type == 'vegetarian':
@@ -1,12 +1,40 @@
-from odoo import models, fields, api
+import threading
+
+from odoo import models, fields, api, tools
+
+from .perf_stat import profiled
+from .table_version import table_version
+
+# Dish relations that make up a package; a dish listed in several of them
+# (e.g. a curry copied into meat_dishes) is only counted once.
+DISH_RELATIONS = (
+    'meat_dishes',
+    'chicken_curry_ids',
+    'mutton_curry_ids',
+    'beef_curry_ids',
+    'rice_dish_ids',
+    'dessert_ids',
+    'salad_ids',
+    'drink_ids',
+    'bread_ids',
+)
+
+# Per-process counters of the catalog index, see get_catalog_stats()
+CATALOG_STATS = {'lookups': 0, 'misses': 0}
+CATALOG_STATS_LOCK = threading.Lock()
 
 
 class MenuMeal(models.Model):
     _name = 'menu.meal'
+    _inherit = ['event.catalog.search.mixin']
     _description = 'Menu Meal Package'
     _order = 'event_category_id, name'
 
-    name = fields.Char('Meal Package Name', required=True)
+    _catalog_fields = ('name', 'meat_type', 'event_category_id', 'total_meal_price',
+                       'price_breakdown', 'description')
+    _catalog_filters = ('meat_type', 'event_category_id')
+
+    name = fields.Char('Meal Package Name', required=True, index='trigram')
     event_category_id = fields.Many2one('event.category', string='Event Category')
     meat_type = fields.Selection([
         ('chicken', 'Chicken'),
@@ -48,11 +76,37 @@ class MenuMeal(models.Model):
                                  string='Bread')
 
     # Computed fields
-    total_meal_price = fields.Float('Total Price', store=True)
+    total_meal_price = fields.Float('Total Price', compute='_compute_total_meal_price', store=True)
+    price_breakdown = fields.Json('Price Breakdown', compute='_compute_total_meal_price', store=True,
+                                  help='Per person price of each course, keyed by dish relation')
     description = fields.Text('Description')
     active = fields.Boolean('Active', default=True)
     is_selected = fields.Boolean('Is Selected', default=False)
 
+    def init(self):
+        # Catalog filters followed by the keyset order, for search_catalog
+        tools.create_index(self.env.cr, 'menu_meal_catalog_idx', self._table,
+                           ['meat_type', 'event_category_id', 'name', 'id'], where='active')
+        tools.create_index(self.env.cr, 'menu_meal_name_id_idx', self._table,
+                           ['name', 'id'], where='active')
+
+    # ==================== COMPUTED FIELDS ====================
+
+    # Inactive dishes drop out of the relations, so their price no longer counts
+    @api.depends(*(f'{relation}.{fname}' for relation in DISH_RELATIONS for fname in ('price', 'active')))
+    def _compute_total_meal_price(self):
+        """Calculate the per person package price from its dishes"""
+        for record in self:
+            breakdown = {}
+            counted = self.env['menu.dishes']
+            for relation in DISH_RELATIONS:
+                dishes = record[relation] - counted
+                counted |= dishes
+                if dishes:
+                    breakdown[relation] = sum(dishes.mapped('price'))
+            record.price_breakdown = breakdown
+            record.total_meal_price = sum(breakdown.values())
+
     # ==================== ONCHANGE METHODS ====================
     
     @api.onchange('meat_type')
@@ -70,6 +124,50 @@ class MenuMeal(models.Model):
 
     
 
+    # ==================== CATALOG INDEX ====================
+
+    @api.model
+    def _get_catalog(self):
+        """Return the active packages indexed by (meat_type, event_category_id).
+
+        Either part of the key may be None to match all values, so
+        ``catalog[(None, None)]`` lists every active package.  Ids keep the
+        model order.  The index lives in the registry cache keyed on the
+        version of the menu_meal table, so a created, removed or modified
+        package yields a new index once its transaction commits.
+        """
+        with CATALOG_STATS_LOCK:
+            CATALOG_STATS['lookups'] += 1
+        return self._build_catalog(table_version(self.env, 'menu.meal'))
+
+    @api.model
+    @tools.ormcache('version')
+    def _build_catalog(self, version):
+        with CATALOG_STATS_LOCK:
+            CATALOG_STATS['misses'] += 1
+        catalog = {}
+        packages = self.sudo().search_read([('active', '=', True)], ['meat_type', 'event_category_id'])
+        for package in packages:
+            meat_type = package['meat_type'] or None
+            category_id = package['event_category_id'] and package['event_category_id'][0] or None
+            for key in {(meat_type, category_id), (meat_type, None), (None, category_id), (None, None)}:
+                catalog.setdefault(key, []).append(package['id'])
+        return tools.frozendict({key: tuple(ids) for key, ids in catalog.items()})
+
+    @api.model
+    def get_catalog_stats(self):
+        """Return the hit/miss counters of the catalog index in this process"""
+        with CATALOG_STATS_LOCK:
+            lookups, misses = CATALOG_STATS['lookups'], CATALOG_STATS['misses']
+        return {'hits': lookups - misses, 'misses': misses}
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(relation in vals for relation in DISH_RELATIONS):
+            # Fast path: refresh dependent booking totals in one SQL pass
+            self.env['event.booking']._recompute_pending_price_totals()
+        return res
+
     # ==================== BOOKING INTEGRATION ACTIONS ====================
     
     def action_add_to_booking(self):
@@ -77,7 +175,7 @@ class MenuMeal(models.Model):
         booking_id = self.env.context.get('default_booking_id')
         if booking_id:
             booking = self.env['event.booking'].browse(booking_id)
-            booking.selected_meal_package = self.id
+            booking.selected_meal_packages = [(4, self.id)]
             return {'type': 'ir.actions.act_window_close'}
         return {
             'type': 'ir.actions.client',
@@ -88,33 +186,6 @@ class MenuMeal(models.Model):
             }
         }
 
-    def action_select_meal_package(self):
-        """Select meal package from available packages"""
-        # Try multiple ways to find the booking
-        booking = None
-        
-        # Method 1: From context
-        booking_id = self.env.context.get('default_booking_id') or self.env.context.get('active_id')
-        if booking_id and self.env.context.get('active_model') == 'event.booking':
-            booking = self.env['event.booking'].browse(booking_id)
-        
-        # Method 2: Find booking that has this meal in available packages
-        if not booking:
-            booking = self.env['event.booking'].search([('available_meal_packages', 'in', self.id)], limit=1)
-        
-        # Method 3: Find any draft booking (fallback)
-        if not booking:
-            booking = self.env['event.booking'].search([('status', '=', 'draft')], limit=1)
-            
-        if booking:
-            booking.write({
-                'selected_meal_packages': [(4, self.id)],
-                'selected_meal_package': self.id
-            })
-        return True
-
-
-
     # ==================== MEAL PACKAGE MANAGEMENT ====================
     
     def action_cancel_meal_package(self):
@@ -123,21 +194,15 @@ class MenuMeal(models.Model):
         if booking_id:
             booking = self.env['event.booking'].browse(booking_id)
             booking.selected_meal_packages = [(3, self.id)]
-            if booking.selected_meal_package and booking.selected_meal_package.id == self.id:
-                booking.selected_meal_package = False
         return {'type': 'ir.actions.act_window_close'}
 
+    @profiled
     def action_select_meal_package(self):
         """Select this meal package for the current booking"""
         booking_id = self.env.context.get('active_id')
         if booking_id:
             booking = self.env['event.booking'].browse(booking_id)
             booking.selected_meal_packages = [(4, self.id)]
-            booking.selected_meal_package = self.id
-            # Trigger recomputation of price fields
-            booking._compute_dishes_per_person()
-            booking._compute_total_dishes_cost()
-            booking._compute_grand_total()
         return {'type': 'ir.actions.act_window_close'}
 
     def action_edit_meal(self):
@@ -0,0 +1,136 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from odoo import models, fields, api
+from odoo.tools import SQL, split_every
+
+_logger = logging.getLogger(__name__)
+
+PARAM_ENABLED = 'event_management.perf_enabled'
+PARAM_LOG = 'event_management.perf_log'
+PARAM_BUFFER_SIZE = 'event_management.perf_buffer_size'
+DEFAULT_BUFFER_SIZE = 10000
+# How long a worker trusts its copy of the system parameters, in seconds
+SETTINGS_TTL = 10.0
+
+# Per-process state: {dbname: (expires_at, enabled, log)} and samples not yet saved
+_settings = {}
+_pending = deque(maxlen=DEFAULT_BUFFER_SIZE)
+_pending_lock = threading.Lock()
+
+
+def _get_settings(env):
+    """Return (enabled, log) for the database, reading the parameters at most every SETTINGS_TTL"""
+    now = time.monotonic()
+    cached = _settings.get(env.cr.dbname)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+    params = env['ir.config_parameter'].sudo()
+    enabled = params.get_param(PARAM_ENABLED, 'False').lower() in ('1', 'true')
+    log = params.get_param(PARAM_LOG, 'False').lower() in ('1', 'true')
+    _settings[env.cr.dbname] = (now + SETTINGS_TTL, enabled, log)
+    return enabled, log
+
+
+@contextmanager
+def perf_section(env, name, record_count=0):
+    """Record query count, wall time and record count of the block as an event.perf.stat sample.
+
+    Costs one dict lookup when profiling is off.
+    """
+    enabled, log = _get_settings(env)
+    if not enabled:
+        yield
+        return
+    cr = env.cr
+    queries = cr.sql_log_count
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample = {
+            'name': name,
+            'record_count': record_count,
+            'query_count': cr.sql_log_count - queries,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'uid': env.uid,
+        }
+        if log:
+            _logger.info("event_perf %s", json.dumps(sample))
+        with _pending_lock:
+            _pending.append((cr.dbname, fields.Datetime.now(), sample))
+        # Saved from a separate cursor once the request's transaction is over
+        if 'event_perf_flush' not in cr.postcommit.data:
+            cr.postcommit.data['event_perf_flush'] = True
+            cr.postcommit.add(functools.partial(env['event.perf.stat']._flush_pending, env.registry))
+
+
+def profiled(method):
+    """Decorate a model method so that every call is recorded by perf_section"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with perf_section(self.env, f'{self._name}.{method.__name__}', len(self)):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class EventPerfStat(models.Model):
+    _name = 'event.perf.stat'
+    _description = 'Event Management Performance Sample'
+    _order = 'id desc'
+    _log_access = False
+
+    # Samples are buffered in memory by perf_section() and written after
+    # commit.  The table is a ring buffer: only the last
+    # event_management.perf_buffer_size samples are kept.
+
+    name = fields.Char('Method', readonly=True, index=True)
+    recorded_at = fields.Datetime('Recorded At', readonly=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True)
+    record_count = fields.Integer('Records', readonly=True, aggregator='avg')
+    query_count = fields.Integer('Queries', readonly=True, aggregator='avg')
+    duration_ms = fields.Float('Duration (ms)', readonly=True, aggregator='avg')
+
+    @api.model
+    def _flush_pending(self, registry):
+        """Write the buffered samples of the registry's database and trim the table"""
+        with _pending_lock:
+            samples = [item for item in _pending if item[0] == registry.db_name]
+            kept = [item for item in _pending if item[0] != registry.db_name]
+            _pending.clear()
+            _pending.extend(kept)
+        if not samples:
+            return
+        try:
+            with registry.cursor() as cr:
+                for chunk in split_every(1000, samples):
+                    cr.execute(SQL(
+                        "INSERT INTO event_perf_stat "
+                        "(name, recorded_at, user_id, record_count, query_count, duration_ms) VALUES %s",
+                        SQL(", ").join(
+                            SQL("(%s, %s, %s, %s, %s, %s)", sample['name'], recorded_at, sample['uid'],
+                                sample['record_count'], sample['query_count'], sample['duration_ms'])
+                            for _dbname, recorded_at, sample in chunk),
+                    ))
+                cr.execute("SELECT value FROM ir_config_parameter WHERE key = %s", [PARAM_BUFFER_SIZE])
+                row = cr.fetchone()
+                size = int(row[0]) if row and row[0] else DEFAULT_BUFFER_SIZE
+                cr.execute("""
+                    DELETE FROM event_perf_stat
+                     WHERE id <= (SELECT MAX(id) FROM event_perf_stat) - %s
+                """, [size])
+        except Exception:
+            _logger.warning("Could not save %s performance samples", len(samples), exc_info=True)
+
+    @api.model
+    def action_clear(self):
+        """Drop every recorded sample"""
+        self.check_access('unlink')
+        # Row locks only: TRUNCATE would block the sample writers of every worker
+        self.search([]).unlink()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
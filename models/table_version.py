@@ -0,0 +1,22 @@
+from odoo.tools import SQL
+
+
+def table_version(env, *models):
+    """Return a value that changes whenever a row of the models' tables is created, updated or deleted.
+
+    Used as the key of registry caches derived from those tables, instead of
+    clearing the whole registry cache on every write.  Every new row
+    version gets a new xmin, so the sum moves on any update, computed and
+    related columns included, and the count on deletions.  Pending ORM
+    writes are flushed first so the transaction sees its own changes.
+    Other workers see a new version as soon as the writing transaction
+    commits, never before.
+    """
+    for model_name in models:
+        env[model_name].flush_model()
+    env.cr.execute(SQL("SELECT %s", SQL(", ").join(
+        SQL("(SELECT ROW(COUNT(*), SUM(xmin::text::bigint))::text FROM %s)",
+            SQL.identifier(env[model_name]._table))
+        for model_name in models
+    )))
+    return env.cr.fetchone()
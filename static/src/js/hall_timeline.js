@@ -0,0 +1,79 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { Component, onWillStart, useState } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+
+const { DateTime } = luxon;
+
+export class HallTimeline extends Component {
+    static template = "event_management.HallTimeline";
+    static props = ["*"];
+
+    setup() {
+        this.orm = useService("orm");
+        this.notification = useService("notification");
+        this.state = useState({
+            month: DateTime.utc().startOf("month"),
+            halls: [],
+            days: [],
+            busy: {},
+            loading: false,
+        });
+        onWillStart(() => this.load());
+    }
+
+    async load() {
+        this.state.loading = true;
+        try {
+            const dateFrom = this.state.month;
+            const dateTo = dateFrom.endOf("month");
+            const [halls, availability] = await Promise.all([
+                this.orm.searchRead("event.hall", [], ["id", "name", "capacity"], {
+                    order: "capacity asc",
+                }),
+                this.orm.call("event.hall", "get_availability", [
+                    dateFrom.toISODate(),
+                    dateTo.toISODate(),
+                    false,
+                    "interval",
+                ]),
+            ]);
+            const busy = {};
+            for (const [hallId, triples] of Object.entries(availability.halls)) {
+                const minutes = {};
+                for (const [offset, start, end] of triples) {
+                    minutes[offset] = (minutes[offset] || 0) + end - start;
+                }
+                busy[hallId] = minutes;
+            }
+            this.state.halls = halls;
+            this.state.days = Array.from({ length: dateTo.day }, (_, i) => dateFrom.plus({ days: i }));
+            this.state.busy = busy;
+        } catch (error) {
+            this.notification.add("Error loading hall availability", { type: "danger" });
+        } finally {
+            this.state.loading = false;
+        }
+    }
+
+    cellClass(hallId, offset) {
+        const minutes = this.state.busy[hallId]?.[offset] || 0;
+        if (!minutes) {
+            return "hall-timeline-free";
+        }
+        return minutes >= 720 ? "hall-timeline-busy" : "hall-timeline-partial";
+    }
+
+    cellTitle(hallId, offset) {
+        const minutes = this.state.busy[hallId]?.[offset] || 0;
+        return minutes ? `${Math.round(minutes / 6) / 10} h booked` : "Free";
+    }
+
+    async changeMonth(delta) {
+        this.state.month = this.state.month.plus({ months: delta });
+        await this.load();
+    }
+}
+
+registry.category("actions").add("event_management.hall_timeline", HallTimeline, { force: true });
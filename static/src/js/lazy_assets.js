@@ -0,0 +1,63 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { LazyComponent, loadBundle } from "@web/core/assets";
+import { Component, onWillStart, xml } from "@odoo/owl";
+import { standardFieldProps } from "@web/views/fields/standard_field_props";
+import { formView } from "@web/views/form/form_view";
+import { kanbanView } from "@web/views/kanban/kanban_view";
+
+// Styles, widgets and the hall timeline live in their own bundle, fetched the
+// first time a view or action of the module needs them.
+export const BOOKING_BUNDLE = "event_management.assets_booking";
+
+function withBookingBundle(Controller) {
+    return class extends Controller {
+        setup() {
+            super.setup();
+            onWillStart(() => loadBundle(BOOKING_BUNDLE));
+        }
+    };
+}
+
+const viewRegistry = registry.category("views");
+viewRegistry.add("event_management_form", {
+    ...formView,
+    Controller: withBookingBundle(formView.Controller),
+});
+viewRegistry.add("event_management_kanban", {
+    ...kanbanView,
+    Controller: withBookingBundle(kanbanView.Controller),
+});
+
+// Field widgets are looked up when the arch is parsed, before any bundle
+// could be loaded: register a stand-in that renders the real widget, from
+// the lazy_components registry, once the bundle is in.
+class LazyMealSelection extends Component {
+    static template = xml`
+        <LazyComponent bundle="bundle" Component="'event_management.MealSelectionWidget'" props="props"/>`;
+    static components = { LazyComponent };
+    static props = { ...standardFieldProps };
+    bundle = BOOKING_BUNDLE;
+}
+
+registry.category("fields").add("meal_selection", {
+    component: LazyMealSelection,
+    supportedTypes: ["many2many"],
+});
+
+// Stands in for client actions of the bundle until it is loaded; the real
+// action replaces this entry, then the action is run again.
+const actionRegistry = registry.category("actions");
+function addLazyAction(tag) {
+    const loader = async (env, action) => {
+        await loadBundle(BOOKING_BUNDLE);
+        if (actionRegistry.get(tag) === loader) {
+            throw new Error(`Action ${tag} is missing from ${BOOKING_BUNDLE}`);
+        }
+        return action;
+    };
+    actionRegistry.add(tag, loader);
+}
+
+addLazyAction("event_management.hall_timeline");
@@ -1,10 +1,13 @@
 /** @odoo-module **/
 
 import { registry } from "@web/core/registry";
-import { Component, useState } from "@odoo/owl";
+import { Component, onWillStart, onWillUnmount, useState } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
+import { debounce } from "@web/core/utils/timing";
 import { standardFieldProps } from "@web/views/fields/standard_field_props";
 
+const FLUSH_DELAY = 300;
+
 export class MealSelectionWidget extends Component {
     static template = "event_management.MealSelectionWidget";
     static props = {
@@ -15,59 +18,116 @@ export class MealSelectionWidget extends Component {
         this.orm = useService("orm");
         this.notification = useService("notification");
         this.state = useState({
-            selectedMeals: [],
+            selectedIds: [],
+            availableIds: [],
+            packages: {},
             meatFilter: null,
+            dishesTotal: 0,
             totalCost: 0
         });
+        // Operations clicked since the last server round-trip
+        this.pendingOps = [];
+        this.flush = debounce(() => this.flushChanges(), FLUSH_DELAY);
+        onWillStart(() => this.syncState());
+        onWillUnmount(() => this.flush.cancel());
     }
 
-    async selectMealPackage(mealId) {
+    async syncState() {
         if (!this.props.record?.resId) return;
-        try {
-            await this.orm.write("event.booking", [this.props.record.resId], {
-                selected_meal_packages: [[4, mealId]]
-            });
-            await this.props.record.load();
-            this.notification.add("Meal package added!", { type: "success" });
-        } catch (error) {
-            this.notification.add("Error adding meal package", { type: "danger" });
+        const result = await this.orm.call("event.booking", "apply_meal_changes", [
+            [this.props.record.resId],
+            [],
+        ]);
+        this.applyServerState(result);
+    }
+
+    applyServerState(result) {
+        Object.assign(this.state.packages, result.packages);
+        this.state.selectedIds = result.selected_meal_package_ids;
+        this.state.availableIds = result.available_meal_package_ids;
+        this.state.meatFilter = result.meat_type_filter || "all";
+        this.state.dishesTotal = result.dishes_total;
+        // Clicks made while the request was in flight stay visible
+        for (const op of this.pendingOps) {
+            this.applyLocally(op);
         }
+        this.state.totalCost = this.calculateTotalCost();
     }
 
-    async removeMealPackage(mealId) {
-        if (!this.props.record?.resId) return;
-        try {
-            await this.orm.write("event.booking", [this.props.record.resId], {
-                selected_meal_packages: [[3, mealId]]
-            });
-            await this.props.record.load();
-            this.notification.add("Meal package removed!", { type: "info" });
-        } catch (error) {
-            this.notification.add("Error removing meal package", { type: "danger" });
+    applyLocally(op) {
+        const selected = this.state.selectedIds;
+        if (op.op === "add" && !selected.includes(op.meal_id)) {
+            selected.push(op.meal_id);
+        } else if (op.op === "remove") {
+            this.state.selectedIds = selected.filter((id) => id !== op.meal_id);
+        } else if (op.op === "exclude") {
+            this.state.selectedIds = selected.filter((id) => id !== op.meal_id);
+            this.state.availableIds = this.state.availableIds.filter((id) => id !== op.meal_id);
+        } else if (op.op === "filter") {
+            this.state.meatFilter = op.meat_type || "all";
         }
     }
 
-    async filterByMeatType(meatType) {
+    queue(op) {
         if (!this.props.record?.resId) return;
+        this.pendingOps.push(op);
+        this.applyLocally(op);
+        this.state.totalCost = this.calculateTotalCost();
+        this.flush();
+    }
+
+    async flushChanges() {
+        const ops = this.pendingOps.splice(0);
+        if (!ops.length) return;
         try {
-            this.state.meatFilter = meatType;
-            await this.orm.write("event.booking", [this.props.record.resId], {
-                meat_type_filter: meatType
-            });
-            await this.props.record.load();
+            const result = await this.orm.call("event.booking", "apply_meal_changes", [
+                [this.props.record.resId],
+                ops,
+            ]);
+            this.applyServerState(result);
+            if (!this.pendingOps.length) {
+                this.refreshRecord(result);
+            }
         } catch (error) {
-            this.notification.add("Error filtering meals", { type: "danger" });
+            this.notification.add("Error updating meal packages", { type: "danger" });
+            await this.syncState();
         }
     }
 
+    refreshRecord(result) {
+        // The server saved the selection and recomputed the booking totals:
+        // show them as the record's saved values, without a reload and
+        // without marking the record dirty, so unsaved edits are kept
+        const record = this.props.record;
+        const values = { ...result.totals, meat_type_filter: result.meat_type_filter };
+        record._applyValues(
+            Object.fromEntries(Object.entries(values).filter(([name]) => name in record.activeFields))
+        );
+    }
+
+    selectMealPackage(mealId) {
+        this.queue({ op: "add", meal_id: mealId });
+    }
+
+    removeMealPackage(mealId) {
+        this.queue({ op: "remove", meal_id: mealId });
+    }
+
+    excludeMealPackage(mealId) {
+        this.queue({ op: "exclude", meal_id: mealId });
+    }
+
+    filterByMeatType(meatType) {
+        this.queue({ op: "filter", meat_type: meatType === "all" ? false : meatType });
+    }
+
     calculateTotalCost() {
-        const dishes = this.props.record?.data?.selected_dishes || [];
-        const meals = this.props.record?.data?.selected_meal_packages || [];
-        return dishes.reduce((sum, dish) => sum + (dish.price || 0), 0) + 
-               meals.reduce((sum, meal) => sum + (meal.total_meal_price || 0), 0);
+        return this.state.selectedIds.reduce(
+            (sum, id) => sum + (this.state.packages[id]?.total_meal_price || 0),
+            this.state.dishesTotal
+        );
     }
 }
 
-registry.category("fields").add("meal_selection", {
-    component: MealSelectionWidget,
-});
\ No newline at end of file
+// Rendered by the meal_selection field of lazy_assets.js
+registry.category("lazy_components").add("event_management.MealSelectionWidget", MealSelectionWidget);
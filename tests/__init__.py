@@ -0,0 +1,9 @@
+from . import test_booking_archive
+from . import test_booking_import
+from . import test_booking_pricing
+from . import test_booking_quote
+from . import test_booking_reference
+from . import test_hall_availability
+from . import test_meal_selection
+from . import test_performance
+from . import test_query_counts
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from odoo.tests import TransactionCase
+
+
+class EventManagementCase(TransactionCase):
+    """Halls, an event type, a category and a small catalog to book against"""
+
+    # Far enough in the future to be clear of any existing booking
+    BASE = datetime(2100, 1, 1, 10, 0)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.event_type = cls.env['event.type'].create({'name': 'Test', 'code': 'TEST'})
+        cls.category = cls.env['event.category'].create({
+            'name': 'Test', 'event_type_id': cls.event_type.id,
+        })
+        cls.halls = cls.env['event.hall'].create([
+            {'name': f'Test Hall {i}', 'capacity': 50 * (i + 1)} for i in range(5)
+        ])
+        cls.dish_categories = cls.env['dish.category'].create([
+            {'name': f'Test Category {i}', 'price': 100 + 25 * i} for i in range(5)
+        ])
+        cls.dishes = cls.env['menu.dishes'].create([{
+            'name': f'Test Dish {i}',
+            'dish_category_id': cls.dish_categories[i % 5].id,
+            'meal_type': 'dinner',
+            'meat_type': ('chicken', 'mutton', 'beef')[i % 3],
+            'preparation_time': 15 + i,
+        } for i in range(30)])
+        cls.packages = cls.env['menu.meal'].create([{
+            'name': f'Test Package {i}',
+            'event_category_id': cls.category.id,
+            'meat_type': ('chicken', 'mutton', 'beef')[i % 3],
+            'rice_dish_ids': [(6, 0, cls.dishes[i::6][:2].ids)],
+            'dessert_ids': [(6, 0, cls.dishes[i + 1::6][:1].ids)],
+        } for i in range(6)])
+        cls.amenities = cls.env['event.amenity'].create([
+            {'name': f'Test Amenity {i}', 'type': 'decor', 'price': 1000 + 100 * i} for i in range(5)
+        ])
+
+    @classmethod
+    def _booking_vals(cls, count, hours=2, **vals):
+        """Return vals of count bookings with a full selection.
+
+        Bookings are dealt round-robin over the halls in back-to-back slots,
+        so they never overlap.
+        """
+        halls = cls.halls
+        return [dict({
+            'name': f'Test Customer {i}',
+            'phone': '000',
+            'start_time': cls.BASE + timedelta(hours=hours * (i // len(halls))),
+            'end_time': cls.BASE + timedelta(hours=hours * (i // len(halls) + 1)),
+            'booking_date': (cls.BASE + timedelta(hours=hours * (i // len(halls)))).date(),
+            'event_type_id': cls.event_type.id,
+            'event_category_id': cls.category.id,
+            'hall_id': halls[i % len(halls)].id,
+            'total_person': 50 + i % 300,
+            'meat_type_filter': ('chicken', 'mutton', 'beef', False)[i % 4],
+            'amenities': [(6, 0, cls.amenities[i % 3:i % 3 + 2].ids)],
+            'selected_dishes': [(6, 0, cls.dishes[i % 20:i % 20 + 4].ids)],
+            'selected_meal_packages': [(6, 0, cls.packages[i % len(cls.packages)].ids)],
+        }, **vals) for i in range(count)]
@@ -0,0 +1,23 @@
+from odoo.tests import tagged
+
+from .common import EventManagementCase
+
+
+@tagged('post_install', '-at_install')
+class TestBookingArchive(EventManagementCase):
+
+    def test_attachments_follow_booking(self):
+        booking = self.env['event.booking'].create(self._booking_vals(1))
+        attachment = self.env['ir.attachment'].create({
+            'name': 'Confirmation.pdf',
+            'raw': b'%PDF-1.4',
+            'res_model': 'event.booking',
+            'res_id': booking.id,
+            'description': 'confirmation',
+        })
+        booking_id = booking.id
+        self.env['event.booking.archive']._archive_bookings([booking_id])
+        self.assertFalse(booking.exists())
+        self.assertEqual(attachment.res_model, 'event.booking.archive')
+        self.assertEqual(attachment.res_id, booking_id)
+        self.assertTrue(self.env['event.booking.archive'].browse(booking_id).exists())
@@ -0,0 +1,30 @@
+import base64
+
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+
+from .common import EventManagementCase
+
+
+@tagged('post_install', '-at_install')
+class TestBookingImport(EventManagementCase):
+
+    def _csv(self, hall_name, count=3):
+        lines = ['name,phone,start_time,end_time,booking_date,event_type,event_category,hall']
+        lines += [
+            f'Import {i},000,2100-02-0{i + 1} 10:00:00,2100-02-0{i + 1} 12:00:00,2100-02-0{i + 1},'
+            f'{self.event_type.name},{self.category.name},{hall_name}'
+            for i in range(count)
+        ]
+        return base64.b64encode('\n'.join(lines).encode())
+
+    def test_import_file(self):
+        ids = self.env['event.booking'].bulk_import_file(self._csv(self.halls[0].name), chunk_size=2)
+        bookings = self.env['event.booking'].browse(ids)
+        self.assertEqual(len(bookings), 3)
+        self.assertEqual(bookings.hall_id, self.halls[0])
+
+    def test_ambiguous_name(self):
+        self.env['event.hall'].create({'name': self.halls[0].name, 'capacity': 10})
+        with self.assertRaisesRegex(ValidationError, "Row 1: ambiguous hall"):
+            self.env['event.booking'].bulk_import_file(self._csv(self.halls[0].name))
@@ -0,0 +1,65 @@
+from odoo.tests import tagged
+from odoo.tools import float_compare
+
+from odoo.addons.event_management.models.booking_pricing import PRICE_TOTAL_FIELDS
+from .common import EventManagementCase
+
+
+@tagged('post_install', '-at_install')
+class TestBookingPricing(EventManagementCase):
+
+    def test_sql_recompute_matches_orm(self):
+        bookings = self.env['event.booking'].create(self._booking_vals(60))
+        # Inactive dishes and packages count for nothing on both sides
+        (self.dishes[:2] | self.packages[:1]).active = False
+        fnames = list(PRICE_TOTAL_FIELDS)
+        for fname in fnames:
+            self.env.add_to_compute(bookings._fields[fname], bookings)
+        bookings.flush_recordset(fnames)
+        expected = {row['id']: row for row in bookings.read(fnames)}
+
+        self.env.cr.execute(
+            "UPDATE event_booking SET " + ", ".join(f"{fname} = 0" for fname in fnames)
+            + " WHERE id = ANY(%s)", [bookings.ids])
+        bookings.invalidate_recordset(fnames)
+        bookings._recompute_price_totals_sql()
+        bookings.invalidate_recordset(fnames)
+        for row in bookings.read(fnames):
+            for fname in fnames:
+                self.assertEqual(float_compare(row[fname], expected[row['id']][fname], precision_digits=6), 0,
+                                 f"{fname} of booking {row['id']}")
+
+    def test_dish_category_price_change(self):
+        bookings = self.env['event.booking'].create(self._booking_vals(20))
+        category = self.dish_categories[0]
+        affected = bookings.filtered(lambda b: category in b.selected_dishes.dish_category_id)
+        self.assertTrue(affected)
+        before = {booking.id: booking.dishes_per_person for booking in affected}
+        category.price += 10
+        self.env.flush_all()
+        affected.invalidate_recordset(list(PRICE_TOTAL_FIELDS))
+        for booking in affected:
+            self.assertGreater(booking.dishes_per_person, before[booking.id])
+            self.assertAlmostEqual(booking.grand_total,
+                                   booking.dishes_per_person * booking.total_person + booking.amenities_total)
+
+    def test_package_price_follows_dish_active(self):
+        package = self.packages[0]
+        dish = package.rice_dish_ids[:1]
+        price = package.total_meal_price
+        dish.active = False
+        self.assertAlmostEqual(package.total_meal_price, price - dish.price)
+        self.assertAlmostEqual(sum(package.price_breakdown.values()), price - dish.price)
+        dish.active = True
+        self.assertAlmostEqual(package.total_meal_price, price)
+
+    def test_package_price_breakdown(self):
+        package = self.packages[0]
+        rice, dessert = package.rice_dish_ids, package.dessert_ids
+        # A dish listed in two courses counts once, under the first one
+        package.meat_dishes = rice[:1]
+        self.assertEqual(set(package.price_breakdown), {'meat_dishes', 'rice_dish_ids', 'dessert_ids'})
+        self.assertAlmostEqual(package.price_breakdown['meat_dishes'], rice[:1].price)
+        self.assertAlmostEqual(package.price_breakdown['rice_dish_ids'], sum((rice - rice[:1]).mapped('price')))
+        self.assertAlmostEqual(package.price_breakdown['dessert_ids'], sum(dessert.mapped('price')))
+        self.assertAlmostEqual(package.total_meal_price, sum(package.price_breakdown.values()))
@@ -0,0 +1,32 @@
+from odoo.tests import tagged
+
+from .common import EventManagementCase
+
+
+@tagged('post_install', '-at_install')
+class TestBookingQuote(EventManagementCase):
+
+    def test_quote_matches_booking(self):
+        booking = self.env['event.booking'].create(self._booking_vals(1))
+        quote = self.env['event.booking'].quote({'booking_id': booking.id})
+        for fname in ('amenities_total', 'dishes_per_person', 'total_dishes_cost',
+                      'total_meal_price', 'grand_total'):
+            self.assertAlmostEqual(quote[fname], booking[fname], msg=fname)
+
+    def test_quote_follows_dish_category_price(self):
+        Booking = self.env['event.booking']
+        dish = self.dishes[0]
+        scenario = {'total_person': 10, 'selected_dishes': dish.ids}
+        before = Booking.quote(scenario)['grand_total']
+        dish.dish_category_id.price += 50
+        self.assertAlmostEqual(Booking.quote(scenario)['grand_total'], before + 500)
+        dish.active = False
+        self.assertEqual(Booking.quote(scenario)['grand_total'], 0)
+
+    def test_quote_follows_new_amenity(self):
+        Booking = self.env['event.booking']
+        Booking.quote({'total_person': 10})
+        amenity = self.env['event.amenity'].create({'name': 'Quote Amenity', 'type': 'decor', 'price': 750})
+        self.assertEqual(Booking.quote({'total_person': 10, 'amenities': amenity.ids})['amenities_total'], 750)
+        amenity.price = 800
+        self.assertEqual(Booking.quote({'total_person': 10, 'amenities': amenity.ids})['amenities_total'], 800)
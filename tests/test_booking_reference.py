@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from psycopg2 import IntegrityError
+
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+
+@tagged('post_install', '-at_install')
+class TestBookingReference(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.hall = cls.env['event.hall'].create({'name': 'Reference Hall', 'capacity': 100})
+        cls.start = datetime(2100, 1, 1, 10, 0)
+
+    def _book(self, event_type):
+        category = self.env['event.category'].create({
+            'name': f'{event_type.name} Category', 'event_type_id': event_type.id,
+        })
+        start = self.start
+        self.start += timedelta(hours=4)
+        return self.env['event.booking'].create({
+            'name': 'Reference Customer',
+            'phone': '000',
+            'start_time': start,
+            'end_time': start + timedelta(hours=2),
+            'booking_date': start.date(),
+            'event_type_id': event_type.id,
+            'event_category_id': category.id,
+            'hall_id': self.hall.id,
+        })
+
+    def test_same_code_types_share_sequence(self):
+        first, second = self.env['event.type'].create([
+            {'name': 'Reference Wedding', 'code': 'rtst'},
+            {'name': 'Reference Wedding Bis', 'code': ' RTST '},
+        ])
+        bookings = self._book(first) | self._book(second) | self._book(first)
+        self.assertEqual(first.sequence_id, second.sequence_id)
+        self.assertEqual(len(set(bookings.mapped('reference'))), 3)
+        self.assertTrue(all(ref.startswith('RTST-') for ref in bookings.mapped('reference')))
+
+    def test_old_code_sequence_reused(self):
+        first = self.env['event.type'].create({'name': 'Reference Old', 'code': 'ROLD'})
+        old_booking = self._book(first)
+        sequence = first.sequence_id
+        first.code = 'RNEW'
+        self.assertTrue(self._book(first).reference.startswith('RNEW-'))
+        second = self.env['event.type'].create({'name': 'Reference Old Bis', 'code': 'ROLD'})
+        booking = self._book(second)
+        self.assertEqual(second.sequence_id, sequence)
+        self.assertTrue(booking.reference.startswith('ROLD-'))
+        self.assertNotEqual(booking.reference, old_booking.reference)
+
+    def test_code_unique(self):
+        self.env['event.type'].create({'name': 'Reference Unique', 'code': 'RUNQ'})
+        with mute_logger('odoo.sql_db'), self.assertRaises(IntegrityError):
+            self.env['event.type'].create({'name': 'Reference Unique Bis', 'code': 'RUNQ'})
+            self.env.flush_all()
+
+    def test_reserved_code(self):
+        with self.assertRaises(ValidationError):
+            self.env['event.type'].create({'name': 'Reference Global', 'code': 'bkg'})
@@ -0,0 +1,153 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from odoo import api, SUPERUSER_ID
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+from .common import EventManagementCase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install')
+class TestHallAvailability(EventManagementCase):
+
+    def test_overlap_rejected(self):
+        booked, overlapping = self.env['event.booking'].create(self._booking_vals(2, hall_id=self.halls[0].id))
+        overlapping.write({
+            'start_time': booked.start_time + timedelta(minutes=30),
+            'end_time': booked.end_time + timedelta(minutes=30),
+        })
+        booked.action_confirm()
+        with self.assertRaisesRegex(ValidationError,
+                                    f'Hall {self.halls[0].name} is already booked for this time slot'):
+            overlapping.action_confirm()
+            self.env.flush_all()
+
+    def test_contenders_one_confirmed(self):
+        # Every slot is wanted by three overlapping drafts of the same hall
+        slots, contenders = 10, 3
+        bookings = self.env['event.booking'].create([
+            dict(vals, name=f'Contender {slot}-{contender}',
+                 start_time=vals['start_time'] + timedelta(minutes=15 * contender),
+                 end_time=vals['start_time'] + timedelta(hours=2, minutes=15 * contender))
+            for slot, vals in enumerate(self._booking_vals(slots, hours=4))
+            for contender in range(contenders)
+        ])
+        for booking in bookings:
+            try:
+                with self.env.cr.savepoint(), mute_logger('odoo.sql_db'):
+                    booking.action_confirm()
+                    self.env.flush_all()
+            except ValidationError:
+                pass
+        confirmed = bookings.filtered(lambda b: b.status == 'confirmed')
+        self.assertEqual(len(confirmed), slots)
+        self.assertFalse(confirmed._get_hall_conflicts())
+
+    def test_suggest_follows_capacity(self):
+        Hall = self.env['event.hall']
+        self.assertFalse(Hall.suggest(10 ** 6))
+        hall = Hall.create({'name': 'Test Stadium', 'capacity': 10 ** 6})
+        self.assertEqual(Hall.suggest(10 ** 6)['id'], hall.id)
+        hall.capacity = 10 ** 5
+        self.assertFalse(Hall.suggest(10 ** 6))
+        hall.capacity = 2 * 10 ** 6
+        self.assertEqual(Hall.suggest(10 ** 6)['id'], hall.id)
+        hall.unlink()
+        self.assertFalse(Hall.suggest(10 ** 6))
+
+
+@tagged('-standard', 'post_install', '-at_install', 'perf')
+class TestHallContention(TransactionCase):
+    """Concurrent confirmations of overlapping bookings, one cursor per thread.
+
+    The bookings have to be visible to every thread, so they are committed
+    and removed again at the end: not part of the standard run, select it
+    with --test-tags perf.
+    """
+
+    THREADS = 8
+
+    def _setup_contenders(self, env):
+        """Commit THREADS drafts of one hall, all overlapping each other on the same day"""
+        event_type = env['event.type'].create({'name': 'Contention', 'code': 'CTND'})
+        category = env['event.category'].create({'name': 'Contention', 'event_type_id': event_type.id})
+        hall = env['event.hall'].create({'name': 'Contention Hall', 'capacity': 100})
+        start = datetime(2100, 6, 1, 10, 0)
+        bookings = env['event.booking'].create([{
+            'name': f'Contender {i}',
+            'phone': '000',
+            'start_time': start + timedelta(minutes=10 * i),
+            'end_time': start + timedelta(hours=3, minutes=10 * i),
+            'booking_date': start.date(),
+            'event_type_id': event_type.id,
+            'event_category_id': category.id,
+            'hall_id': hall.id,
+        } for i in range(self.THREADS)])
+        return event_type, category, hall, bookings
+
+    def _teardown_contenders(self, env, event_type, category, hall, bookings):
+        bookings = bookings.exists()
+        env['event.booking.job'].search([('booking_id', 'in', bookings.ids)]).unlink()
+        env['event.booking.message'].search([('booking_id', 'in', bookings.ids)]).unlink()
+        bookings.unlink()
+        sequence = event_type.sequence_id
+        (category | hall).unlink()
+        event_type.unlink()
+        sequence.unlink()
+
+    def test_concurrent_confirm(self):
+        with self.registry.cursor() as cr:
+            fixtures = self._setup_contenders(api.Environment(cr, SUPERUSER_ID, {}))
+            booking_ids = fixtures[-1].ids
+        try:
+            barrier = threading.Barrier(self.THREADS)
+            outcomes = {}
+
+            def confirm(booking_id):
+                try:
+                    with self.registry.cursor() as cr:
+                        booking = api.Environment(cr, SUPERUSER_ID, {})['event.booking'].browse(booking_id)
+                        barrier.wait()
+                        booking.action_confirm()
+                        booking.env.flush_all()
+                    outcomes[booking_id] = 'confirmed'
+                except Exception as e:
+                    # Asserted on by the main thread
+                    outcomes[booking_id] = e
+
+            threads = [threading.Thread(target=confirm, args=(booking_id,)) for booking_id in booking_ids]
+            start = time.perf_counter()
+            with mute_logger('odoo.sql_db'):
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            elapsed = time.perf_counter() - start
+
+            confirmed = [booking_id for booking_id, outcome in outcomes.items() if outcome == 'confirmed']
+            rejected = [outcome for outcome in outcomes.values() if outcome != 'confirmed']
+            self.assertEqual(len(outcomes), self.THREADS)
+            self.assertEqual(len(confirmed), 1, outcomes)
+            for error in rejected:
+                self.assertIsInstance(error, ValidationError)
+                self.assertRegex(str(error), 'Contention Hall is already booked for this time slot')
+            with self.registry.cursor() as cr:
+                cr.execute("SELECT id FROM event_booking WHERE id IN %s AND status = 'confirmed'",
+                           [tuple(booking_ids)])
+                self.assertEqual([row[0] for row in cr.fetchall()], confirmed)
+            _logger.info("event_perf hall_contention %s", json.dumps({
+                'threads': self.THREADS,
+                'ms': round(elapsed * 1000, 3),
+                'confirmations_per_second': round(self.THREADS / elapsed, 1),
+            }))
+        finally:
+            with self.registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                self._teardown_contenders(env, *(records.with_env(env) for records in fixtures))
@@ -0,0 +1,29 @@
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+
+from .common import EventManagementCase
+
+
+@tagged('post_install', '-at_install')
+class TestMealSelection(EventManagementCase):
+
+    def test_apply_meal_changes(self):
+        booking = self.env['event.booking'].create(self._booking_vals(1, meat_type_filter=False))
+        first, second, third = self.packages[:3]
+        state = booking.apply_meal_changes([
+            {'op': 'add', 'meal_id': second.id},
+            {'op': 'add', 'meal_id': third.id},
+            {'op': 'exclude', 'meal_id': first.id},
+            {'op': 'exclude', 'meal_id': third.id},
+        ])
+        self.assertEqual(booking.selected_meal_packages, second)
+        self.assertEqual(booking.excluded_meal_packages, first | third)
+        self.assertEqual(set(state['excluded_meal_package_ids']), {first.id, third.id})
+        self.assertNotIn(first.id, state['available_meal_package_ids'])
+        self.assertAlmostEqual(state['totals']['grand_total'], booking.grand_total)
+
+        with self.assertRaises(ValidationError):
+            booking.apply_meal_changes([{'op': 'add', 'meal_id': first.id}])
+        booking.apply_meal_changes([{'op': 'include', 'meal_id': first.id}, {'op': 'add', 'meal_id': first.id}])
+        self.assertEqual(booking.selected_meal_packages, first | second)
+        self.assertEqual(booking.excluded_meal_packages, third)
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import resource
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from odoo import fields
+from odoo.exceptions import ValidationError
+from odoo.modules import get_manifest
+from odoo.tests import tagged
+from odoo.tools import convert_file, file_path, mute_logger
+
+from .common import EventManagementCase
+
+_logger = logging.getLogger(__name__)
+
+
+class PerformanceCase(EventManagementCase):
+    """Measurement helpers of the performance tests.
+
+    Results are logged as JSON, one line per test.
+    """
+
+    @contextmanager
+    def _measure(self, result):
+        """Record wall time (ms) and SQL query count of the block into result"""
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        result['ms'] = round((time.perf_counter() - start) * 1000, 3)
+        result['queries'] = cr.sql_log_count - queries
+
+    def _report(self, name, results):
+        _logger.info("event_perf %s %s", name, json.dumps(results, default=str))
+
+    def _insert_bookings(self, first, last, halls):
+        """Insert confirmed, non-overlapping bookings numbered first..last with plain SQL.
+
+        Slots are two hours long and dealt round-robin over the halls, so rows
+        are spread evenly and never overlap each other.
+        """
+        self.env.cr.execute("""
+            INSERT INTO event_booking (name, phone, start_time, end_time, booking_date,
+                                       event_type_id, event_category_id, hall_id,
+                                       status, total_person)
+            SELECT 'Perf ' || n, '000',
+                   s.slot, s.slot + interval '2 hours', s.slot::date,
+                   %(type)s, %(category)s, (%(halls)s::int[])[1 + n %% %(hall_count)s],
+                   'confirmed', 100
+              FROM generate_series(%(first)s, %(last)s) AS n,
+                   LATERAL (SELECT timestamp '2000-01-01'
+                                   + (n / %(hall_count)s) * interval '2 hours') AS s(slot)
+        """, {
+            'type': self.event_type.id,
+            'category': self.category.id,
+            'halls': halls.ids,
+            'hall_count': len(halls),
+            'first': first,
+            'last': last,
+        })
+        self.env.cr.execute("ANALYZE event_booking")
+
+    def _create_halls(self, count):
+        return self.env['event.hall'].create([
+            {'name': f'Perf Hall {i}', 'capacity': 50 * (i + 1)} for i in range(count)
+        ])
+
+    def _hall_availability_steps(self, sizes):
+        """Time the overlap check and the confirmation of 50 drafts, and the
+        rejection of an overlapping one, with the table grown to each size.
+
+        The confirmations go through the exclusion constraint (or the GiST
+        index fallback), which has to stay flat as the table grows.
+        """
+        Booking = self.env['event.booking']
+        halls = self._create_halls(50)
+        results = []
+        inserted = 0
+        for size in sizes:
+            self._insert_bookings(inserted, size - 1, halls)
+            inserted = size
+            drafts = Booking.create([{
+                'name': f'Probe {i}',
+                'phone': '000',
+                'start_time': self.BASE + timedelta(days=i),
+                'end_time': self.BASE + timedelta(days=i, hours=3),
+                'booking_date': (self.BASE + timedelta(days=i)).date(),
+                'event_type_id': self.event_type.id,
+                'event_category_id': self.category.id,
+                'hall_id': halls[i % len(halls)].id,
+            } for i in range(50)])
+            # Overlaps the last inserted row, see _insert_bookings()
+            clash_start = datetime(2000, 1, 1) + timedelta(hours=2 * ((size - 1) // len(halls)), minutes=30)
+            clash = Booking.create({
+                'name': 'Probe clash',
+                'phone': '000',
+                'start_time': clash_start,
+                'end_time': clash_start + timedelta(hours=2),
+                'booking_date': clash_start.date(),
+                'event_type_id': self.event_type.id,
+                'event_category_id': self.category.id,
+                'hall_id': halls[(size - 1) % len(halls)].id,
+            })
+            self.env.flush_all()
+            result = {'rows': size, 'batch': len(drafts), 'check': {}, 'confirm': {}, 'reject': {}}
+            with self._measure(result['check']):
+                drafts._check_hall_availability()
+            with self._measure(result['confirm']):
+                drafts.action_confirm()
+                self.env.flush_all()
+            with self._measure(result['reject']), self.assertRaises(ValidationError):
+                with self.env.cr.savepoint(), mute_logger('odoo.sql_db'):
+                    clash.action_confirm()
+                    self.env.flush_all()
+            results.append(result)
+            (drafts | clash).unlink()
+        return results
+
+
+@tagged('-standard', 'perf')
+class TestPerformance(PerformanceCase):
+    """Timings of the booking hot paths on large data sets.
+
+    Not part of the standard run: select them with --test-tags perf.
+    """
+
+    def test_hall_availability(self):
+        self._report('hall_availability', self._hall_availability_steps((1000, 10000, 100000)))
+
+    def test_bulk_import(self):
+        halls = self._create_halls(50)
+        count = 100000
+        rows = ({
+            'name': f'Import {i}',
+            'phone': '000',
+            'start_time': self.BASE + timedelta(hours=2 * (i // len(halls))),
+            'end_time': self.BASE + timedelta(hours=2 * (i // len(halls)) + 2),
+            'booking_date': (self.BASE + timedelta(hours=2 * (i // len(halls)))).date(),
+            'event_type': self.event_type.name,
+            'event_category': self.category.name,
+            'hall': halls[i % len(halls)].name,
+            'status': 'confirmed',
+            'total_person': 100,
+        } for i in range(count))
+        result = {'rows': count, 'chunk_size': 1000}
+        with self._measure(result):
+            self.env['event.booking'].bulk_import(rows, chunk_size=1000)
+        self._report('bulk_import', result)
+
+    def test_price_recompute(self):
+        bookings = self.env['event.booking'].create(self._booking_vals(10000))
+        self.env.flush_all()
+        result = {'rows': len(bookings)}
+        with self._measure(result):
+            bookings._recompute_price_totals_sql()
+        self._report('price_recompute', result)
+
+    def test_hall_suggest(self):
+        halls = self._create_halls(50)
+        Hall = self.env['event.hall']
+        Hall.suggest(1)
+        result = {'lookups': 1000, 'halls': len(halls)}
+        with self._measure(result):
+            for i in range(1000):
+                Hall.suggest(1 + i % (50 * len(halls)))
+        drafts = self.env['event.booking'].create([{
+            'name': f'Seat {i}',
+            'phone': '000',
+            'start_time': self.BASE + timedelta(hours=i % 4),
+            'end_time': self.BASE + timedelta(hours=i % 4 + 3),
+            'booking_date': self.BASE.date(),
+            'event_type_id': self.event_type.id,
+            'event_category_id': self.category.id,
+            'hall_id': halls[0].id,
+            'total_person': 20 + 37 * i % (40 * len(halls)),
+        } for i in range(50)])
+        self.env.flush_all()
+        result['assign'] = {}
+        with self._measure(result['assign']):
+            Hall.assign_halls(drafts.ids)
+        self._report('hall_suggest', result)
+
+    def test_hall_availability_calendar(self):
+        halls = self._create_halls(50)
+        days = 365
+        # Twelve back-to-back two hour slots per hall and day, merged into one interval
+        self._insert_bookings(0, len(halls) * days * 12 - 1, halls)
+        date_from = datetime(2000, 1, 1).date()
+        date_to = date_from + timedelta(days=days - 1)
+        Hall = self.env['event.hall']
+        self.env.cr.execute("DELETE FROM event_hall_busy_cache WHERE hall_id = ANY(%s)", [halls.ids])
+        result = {'halls': len(halls), 'days': days, 'cold': {}, 'warm': {}}
+        with self._measure(result['cold']):
+            payload = Hall.get_availability(date_from, date_to, halls.ids)
+        with self._measure(result['warm']):
+            Hall.get_availability(date_from, date_to, halls.ids)
+        result['payload_bytes'] = len(json.dumps(payload))
+        self._report('hall_availability_calendar', result)
+
+    def test_kitchen_plan(self):
+        self.env['event.data.generator'].generate(
+            halls=20, dish_count=1000, package_count=200, bookings=5000, days=120,
+            start=fields.Date.today())
+        self.env.invalidate_all()
+        result = {'bookings': 5000}
+        with self._measure(result):
+            self.env['event.kitchen.plan'].action_generate()
+        result['rows'] = self.env['event.kitchen.plan'].search_count([])
+        self._report('kitchen_plan', result)
+
+    def test_hall_schedule(self):
+        halls = self._create_halls(50)
+        count, days = 500, 3
+        drafts = self.env['event.booking'].create([{
+            'name': f'Schedule {i}',
+            'phone': '000',
+            'start_time': self.BASE + timedelta(days=i % days, minutes=30 * (i * 7 % 28)),
+            'end_time': self.BASE + timedelta(days=i % days, minutes=30 * (i * 7 % 28), hours=2 + i % 5),
+            'booking_date': (self.BASE + timedelta(days=i % days)).date(),
+            'event_type_id': self.event_type.id,
+            'event_category_id': self.category.id,
+            'hall_id': halls[-1].id,
+            'total_person': 20 + (i * 97) % (50 * len(halls)),
+        } for i in range(count)])
+        self.env.flush_all()
+        result = {'bookings': count, 'halls': len(halls), 'days': days}
+        with self._measure(result):
+            proposal = self.env['event.hall'].propose_schedule(drafts.ids)
+        result.update(placed=len(proposal['assignment']), unplaced=len(proposal['unplaced']),
+                      waste=proposal['waste'], current_waste=proposal['current_waste'])
+        self._report('hall_schedule', result)
+
+    def test_booking_jobs(self):
+        bookings = self.env['event.booking'].create(self._booking_vals(200, hours=4))
+        self.env.flush_all()
+        Job = self.env['event.booking.job']
+        result = {'bookings': len(bookings), 'confirm': {}, 'drain': {}}
+        with self._measure(result['confirm']):
+            bookings.action_confirm()
+            self.env.flush_all()
+        result['queued'] = Job.search_count([('state', '=', 'pending')])
+        with self._measure(result['drain']):
+            Job._cron_run_jobs(auto_commit=False)
+        result['failed'] = Job.search_count([('state', 'in', ('pending', 'failed'))])
+        self._report('booking_jobs', result)
+
+    def test_bulk_export(self):
+        self.env['event.data.generator'].generate(halls=20, bookings=100000)
+        self.env.invalidate_all()
+        result = {'bookings': 100000}
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        with self._measure(result):
+            export = self.env['event.booking'].bulk_export('csv')
+        result['max_rss_growth_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak
+        result['file_size'] = self.env['ir.attachment'].browse(export['attachment_id']).file_size
+        self._report('bulk_export', result)
+
+    def test_startup(self):
+        # Upgrade work of the module, and the asset payload of every backend
+        # page against the booking bundle loaded on demand
+        module = 'event_management'
+        manifest = get_manifest(module)
+        model_names = self.env['ir.model'].browse(self.env['ir.model.data'].search([
+            ('module', '=', module), ('model', '=', 'ir.model'),
+        ]).mapped('res_id')).mapped('model')
+        result = {'init_models': {'models': len(model_names)}, 'data_files': {'files': len(manifest['data'])}}
+        with self._measure(result['init_models']):
+            self.env.registry.init_models(self.env.cr, model_names, {'module': module}, install=False)
+        with self._measure(result['data_files']):
+            for filename in manifest['data']:
+                convert_file(self.env, module, filename, {}, mode='update', kind='data')
+        result['payload_bytes'] = {
+            bundle: sum(os.path.getsize(file_path(path)) for path in paths if isinstance(path, str))
+            for bundle, paths in manifest.get('assets', {}).items()
+        }
+        self._report('startup', result)
+
+
+@tagged('-standard', 'perf_1m')
+class TestPerformanceLarge(PerformanceCase):
+    """The hall availability timings at a million bookings.
+
+    Takes minutes and a few GB of database: select it with
+    --test-tags perf_1m.
+    """
+
+    def test_hall_availability(self):
+        self._report('hall_availability', self._hall_availability_steps((100000, 1000000)))
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+
+from odoo.tests import tagged
+
+from odoo.addons.event_management.models.booking_report import REPORT_XMLID
+from .common import EventManagementCase
+
+_logger = logging.getLogger(__name__)
+
+# Every step runs once warm-up, then at each of these batch sizes
+BATCH_SIZES = (20, 100)
+
+# Queries a step may issue once the registry caches are warm: the count of
+# each path plus a few queries of slack.  They hold for every batch size.
+QUERY_CEILINGS = {
+    'create': 30,
+    'overlap_check': 5,
+    'confirm': 30,
+    'recompute_totals': 25,
+    'available_packages': 5,
+    'quote': 8,
+    'report': 35,
+}
+
+# Path of a file to write the measurements to, next to the log line
+RESULTS_FILE_ENV = 'EVENT_QUERY_COUNTS_FILE'
+
+
+@tagged('post_install', '-at_install')
+class TestQueryCounts(EventManagementCase):
+    """The booking hot paths are batched: their query counts stay under a
+    ceiling and do not grow with the batch, so a change bringing back
+    per-record queries fails here.
+
+    Query counts and timings of every step and batch size are logged as
+    JSON, and written to the file named by EVENT_QUERY_COUNTS_FILE if set.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.Booking = self.env['event.booking']
+        self.run_count = 0
+
+    def _run_vals(self, size):
+        """Return vals of size bookings, in slots clear of the ones of earlier runs"""
+        offset = timedelta(days=30 * self.run_count)
+        self.run_count += 1
+        return [dict(
+            vals,
+            start_time=vals['start_time'] + offset,
+            end_time=vals['end_time'] + offset,
+            booking_date=vals['booking_date'] + offset,
+        ) for vals in self._booking_vals(size)]
+
+    def _create_bookings(self, size):
+        return self.Booking.create(self._run_vals(size))
+
+    def _prepare_create(self, size):
+        vals_list = self._run_vals(size)
+        return lambda: self.Booking.create(vals_list)
+
+    def _prepare_overlap_check(self, size):
+        bookings = self._create_bookings(size)
+        return bookings._check_hall_availability
+
+    def _prepare_confirm(self, size):
+        bookings = self._create_bookings(size)
+        return bookings.action_confirm
+
+    def _prepare_recompute_totals(self, size):
+        self._create_bookings(size)
+        category = self.dish_categories[0]
+
+        def recompute():
+            category.price += 10
+        return recompute
+
+    def _prepare_available_packages(self, size):
+        bookings = self._create_bookings(size)
+        return lambda: bookings.mapped('available_meal_packages')
+
+    def _prepare_quote(self, size):
+        bookings = self._create_bookings(size)
+        # One what-if variant per booking, priced in one call
+        scenarios = [{
+            'booking_id': booking.id,
+            'total_person': booking.total_person + 10,
+            'selected_dishes': self.dishes[index % 20:index % 20 + 3].ids,
+        } for index, booking in enumerate(bookings)]
+        return lambda: self.Booking.quote(scenarios)
+
+    def _prepare_report(self, size):
+        bookings = self._create_bookings(size)
+        return lambda: self.env['ir.actions.report']._render_qweb_html(REPORT_XMLID, bookings.ids)
+
+    def _measure(self, step, size):
+        """Return the query count and wall time (ms) of one run of step on a cold ORM cache"""
+        func = getattr(self, f'_prepare_{step}')(size)
+        self.env.flush_all()
+        self.env.invalidate_all()
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        func()
+        self.env.flush_all()
+        return {
+            'queries': cr.sql_log_count - queries,
+            'ms': round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def test_query_counts(self):
+        results = {}
+        for step in QUERY_CEILINGS:
+            # Warm the registry caches (catalog, price table, templates)
+            self._measure(step, 1)
+            results[step] = {size: self._measure(step, size) for size in BATCH_SIZES}
+        _logger.info("event_perf query_counts %s", json.dumps(results))
+        if os.environ.get(RESULTS_FILE_ENV):
+            with open(os.environ[RESULTS_FILE_ENV], 'w') as file:
+                json.dump(results, file, indent=2)
+
+        for step, ceiling in QUERY_CEILINGS.items():
+            small, large = (results[step][size]['queries'] for size in BATCH_SIZES)
+            with self.subTest(step=step):
+                self.assertLessEqual(max(small, large), ceiling,
+                                     f"{step} issued {small} and {large} queries for batches of {BATCH_SIZES}")
+                self.assertLessEqual(large, small,
+                                     f"{step} queries grow with the batch: {small} and {large} for {BATCH_SIZES}")